@@ -64,6 +64,18 @@ class Settings(BaseSettings):
     POWERBI_AUTHORITY: str = f"https://login.microsoftonline.com/{POWERBI_TENANT_ID}"
     POWERBI_API_BASE: str = "https://api.powerbi.com/v1.0/myorg"
 
+    # Shared aiohttp session pool
+    AIOHTTP_SESSION_LIMIT: int = int(os.getenv("AIOHTTP_SESSION_LIMIT", 500))
+    AIOHTTP_SESSION_LIMIT_PER_HOST: int = int(os.getenv("AIOHTTP_SESSION_LIMIT_PER_HOST", 100))
+    AIOHTTP_SESSION_TIMEOUT: int = int(os.getenv("AIOHTTP_SESSION_TIMEOUT", 30))
+
+    # Route Power BI REST calls over a multiplexed HTTP/2 httpx client
+    POWERBI_HTTP2: bool = os.getenv("POWERBI_HTTP2", "false").lower() == "true"
+
+    # Power BI dataset details cache
+    DATASET_CACHE_SIZE: int = int(os.getenv("DATASET_CACHE_SIZE", 64))
+    DATASET_CACHE_TTL: int = int(os.getenv("DATASET_CACHE_TTL", 900))
+
     # Redis Configuration
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
@@ -0,0 +1,48 @@
+"""
+Service dependencies for Seekapa Copilot
+Shared service instances and the FastAPI providers that hand them to the routers
+"""
+
+from typing import List, Dict
+
+from app.services.azure_ai import AzureAIService
+from app.services.powerbi import PowerBIService
+from app.services.websocket import WebSocketManager
+from app.services.ai_foundry_agent import AIFoundryAgent
+from app.services.logic_apps import LogicAppsService
+
+# Initialize services
+azure_ai_service = AzureAIService()
+powerbi_service = PowerBIService()
+websocket_manager = WebSocketManager()
+ai_foundry_agent = AIFoundryAgent()
+logic_apps_service = LogicAppsService()
+
+# Store conversations in memory (in production, use Redis or database)
+conversations: Dict[str, List[Dict]] = {}
+
+
+# Service dependencies (override via app.dependency_overrides in tests)
+def get_azure_ai_service() -> AzureAIService:
+    """Provide the Azure AI service"""
+    return azure_ai_service
+
+
+def get_powerbi_service() -> PowerBIService:
+    """Provide the Power BI service"""
+    return powerbi_service
+
+
+def get_websocket_manager() -> WebSocketManager:
+    """Provide the WebSocket manager"""
+    return websocket_manager
+
+
+def get_ai_foundry_agent() -> AIFoundryAgent:
+    """Provide the AI Foundry agent"""
+    return ai_foundry_agent
+
+
+def get_logic_apps_service() -> LogicAppsService:
+    """Provide the Logic Apps service"""
+    return logic_apps_service
@@ -3,28 +3,24 @@ Seekapa Copilot - Main Application
 Microsoft Copilot-style Power BI Assistant for DS-Axia Dataset
 """
 
-import os
-import json
-import asyncio
-import uuid
-import aiohttp
 from datetime import datetime
-from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, status, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse, Response
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse
 import logging
 from loguru import logger
 
 from app.config import settings
-from app.services.azure_ai import AzureAIService
-from app.services.powerbi import PowerBIService
-from app.services.websocket import WebSocketManager
-from app.services.ai_foundry_agent import AIFoundryAgent
-from app.services.logic_apps import LogicAppsService
+from app.dependencies import (
+    azure_ai_service,
+    powerbi_service,
+    websocket_manager,
+    ai_foundry_agent,
+    logic_apps_service,
+)
+from app.routers import analysis, chat, health, powerbi, webhooks
 
 # Configure logging
 logging.basicConfig(
@@ -32,16 +28,6 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-# Initialize services
-azure_ai_service = AzureAIService()
-powerbi_service = PowerBIService()
-websocket_manager = WebSocketManager()
-ai_foundry_agent = AIFoundryAgent()
-logic_apps_service = LogicAppsService()
-
-# Store conversations in memory (in production, use Redis or database)
-conversations: Dict[str, List[Dict]] = {}
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -88,561 +74,12 @@ app.add_middleware(
 )
 
 
-# Request/Response Models
-class ChatMessage(BaseModel):
-    """Chat message model"""
-    content: str = Field(..., description="Message content")
-    context: Optional[Dict[str, Any]] = Field(None, description="Additional context")
-    conversation_id: Optional[str] = Field(None, description="Conversation ID for context")
-    stream: bool = Field(False, description="Whether to stream the response")
-
-
-class DAXQuery(BaseModel):
-    """DAX query model"""
-    query: str = Field(..., description="DAX query to execute")
-    format: Optional[str] = Field("json", description="Response format (json/csv)")
-
-
-class NaturalLanguageQuery(BaseModel):
-    """Natural language query for DAX generation"""
-    question: str = Field(..., description="Natural language question about the data")
-    include_explanation: bool = Field(True, description="Include explanation with the query")
-
-
-class DataAnalysisRequest(BaseModel):
-    """Data analysis request model"""
-    data: Any = Field(..., description="Data to analyze")
-    analysis_type: str = Field("general", description="Type of analysis: general, trend, anomaly, forecast")
-    question: Optional[str] = Field(None, description="Specific question about the data")
-
-
-class WebhookRequest(BaseModel):
-    """Webhook request model for Logic Apps"""
-    action: str = Field(..., description="Action to perform")
-    data: Dict[str, Any] = Field(..., description="Action data")
-    workflow_id: Optional[str] = Field(None, description="Workflow ID for callbacks")
-    callback_url: Optional[str] = Field(None, description="Callback URL for async responses")
-
-
-class AgentRequest(BaseModel):
-    """Agent request model"""
-    message: str = Field(..., description="User message")
-    thread_id: Optional[str] = Field(None, description="Thread ID for conversation continuity")
-    agent_name: Optional[str] = Field("seekapa-copilot", description="Agent name to use")
-    tools: Optional[List[str]] = Field(None, description="Tools to enable for agent")
-
-
-# API Endpoints
-
-@app.get("/")
-async def root():
-    """Root endpoint with application information"""
-    return {
-        "name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "dataset": settings.POWERBI_AXIA_DATASET_NAME,
-        "dataset_id": settings.POWERBI_AXIA_DATASET_ID,
-        "status": "ready",
-        "style": "Microsoft Copilot for Power BI",
-        "endpoints": {
-            "docs": "/docs",
-            "health": "/health",
-            "websocket": "/ws/chat",
-            "api": {
-                "chat": "/api/chat",
-                "powerbi": "/api/powerbi/*",
-                "analysis": "/api/analysis/*"
-            }
-        }
-    }
-
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "services": {
-            "azure_ai": "operational",
-            "powerbi": "operational",
-            "websocket": "operational",
-            "ai_foundry": "operational",
-            "logic_apps": "operational"
-        },
-        "connections": websocket_manager.connection_manager.get_connection_stats()
-    }
-
-
-@app.get("/api/v1/health/logic-app")
-async def health_check_logic_apps():
-    """Health check for Logic Apps connectivity"""
-    try:
-        result = await logic_apps_service.test_connection()
-        return JSONResponse(
-            status_code=200 if result["status"] != "error" else 503,
-            content={
-                "service": "Azure Logic Apps",
-                "status": result["status"],
-                "details": result,
-                "timestamp": datetime.now().isoformat()
-            }
-        )
-    except Exception as e:
-        logger.error(f"Logic Apps health check error: {e}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "service": "Azure Logic Apps",
-                "status": "error",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-        )
-
-
-@app.get("/api/v1/health/ai-foundry")
-async def health_check_ai_foundry():
-    """Health check for AI Foundry agent service"""
-    try:
-        # Test by creating a temporary thread
-        test_thread = await ai_foundry_agent.create_thread({"health_check": True})
-        await ai_foundry_agent.delete_thread(test_thread)
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "service": "Azure AI Foundry",
-                "status": "operational",
-                "endpoint": ai_foundry_agent.endpoint,
-                "project": ai_foundry_agent.project,
-                "agent_id": ai_foundry_agent.agent_id,
-                "timestamp": datetime.now().isoformat()
-            }
-        )
-    except Exception as e:
-        logger.error(f"AI Foundry health check error: {e}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "service": "Azure AI Foundry",
-                "status": "error",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-        )
-
-
-@app.get("/api/v1/health/webhook")
-async def health_check_webhook():
-    """Validate webhook configuration"""
-    webhook_config = {
-        "logic_app_url": bool(settings.AZURE_LOGIC_APP_URL),
-        "logic_app_key": bool(settings.AZURE_LOGIC_APP_KEY),
-        "ai_foundry_endpoint": bool(settings.AZURE_AI_FOUNDRY_ENDPOINT),
-        "callback_url": f"{settings.APP_BASE_URL}/api/v1/webhook/callback"
-    }
-
-    all_configured = all(webhook_config.values())
-
-    return JSONResponse(
-        status_code=200 if all_configured else 503,
-        content={
-            "service": "Webhook Configuration",
-            "status": "configured" if all_configured else "incomplete",
-            "configuration": webhook_config,
-            "timestamp": datetime.now().isoformat()
-        }
-    )
-
-
-@app.post("/api/chat")
-async def chat(message: ChatMessage):
-    """Chat endpoint for non-WebSocket interactions"""
-    try:
-        # Get or create conversation
-        conversation_id = message.conversation_id or str(uuid.uuid4())
-        if conversation_id not in conversations:
-            conversations[conversation_id] = []
-
-        # Build messages
-        messages = [{"role": "user", "content": message.content}]
-
-        # Add conversation history
-        if conversations[conversation_id]:
-            for turn in conversations[conversation_id][-3:]:
-                messages.insert(0, {"role": "assistant", "content": turn["assistant"]})
-                messages.insert(0, {"role": "user", "content": turn["user"]})
-
-        # Get AI response
-        response = await azure_ai_service.call_gpt5(
-            messages=messages,
-            query=message.content,
-            context=message.context,
-            stream=False,
-            conversation_history=conversations[conversation_id]
-        )
-
-        # Store in conversation history
-        conversations[conversation_id].append({
-            "user": message.content,
-            "assistant": response,
-            "timestamp": datetime.now().isoformat()
-        })
-
-        # Get model stats
-        model_stats = azure_ai_service.model_selector.analyze_query_complexity(message.content)
-
-        return {
-            "response": response,
-            "conversation_id": conversation_id,
-            "model_info": {
-                "complexity": model_stats[0],
-                "confidence": model_stats[1]
-            },
-            "timestamp": datetime.now().isoformat()
-        }
-
-    except Exception as e:
-        logger.error(f"Chat error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# Power BI Endpoints
-
-@app.get("/api/powerbi/axia/info")
-async def get_axia_info():
-    """Get DS-Axia dataset information"""
-    try:
-        dataset_details = await powerbi_service.get_axia_dataset_details()
-        tables = await powerbi_service.get_axia_tables()
-        refresh_history = await powerbi_service.get_refresh_history()
-        reports = await powerbi_service.get_reports_using_axia()
-
-        return {
-            "dataset": settings.POWERBI_AXIA_DATASET_NAME,
-            "dataset_id": settings.POWERBI_AXIA_DATASET_ID,
-            "details": dataset_details,
-            "tables": tables,
-            "refresh_history": refresh_history,
-            "reports": reports,
-            "workspace_id": settings.POWERBI_WORKSPACE_ID
-        }
-    except Exception as e:
-        logger.error(f"Error getting Axia info: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/api/powerbi/axia/query")
-async def query_axia_data(query: DAXQuery):
-    """Execute DAX query on DS-Axia dataset"""
-    try:
-        result = await powerbi_service.query_axia_data(query.query)
-
-        if query.format == "csv" and result.get("success"):
-            # Convert to CSV format
-            import csv
-            import io
-
-            output = io.StringIO()
-            if result.get("data"):
-                writer = csv.DictWriter(output, fieldnames=result["columns"])
-                writer.writeheader()
-                writer.writerows(result["data"])
-
-            return StreamingResponse(
-                io.StringIO(output.getvalue()),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=axia_query_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"}
-            )
-
-        return result
-    except Exception as e:
-        logger.error(f"Query error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/api/powerbi/axia/query/natural")
-async def natural_language_to_dax(query: NaturalLanguageQuery):
-    """Convert natural language to DAX query"""
-    try:
-        result = await azure_ai_service.generate_dax_query(query.question)
-
-        # If DAX was generated, try to execute it
-        if result.get("dax_query") and not result.get("error"):
-            execution_result = await powerbi_service.query_axia_data(result["dax_query"])
-            result["execution_result"] = execution_result
-
-        return result
-    except Exception as e:
-        logger.error(f"Natural language query error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/api/powerbi/axia/refresh")
-async def refresh_axia_dataset():
-    """Trigger a refresh of the DS-Axia dataset"""
-    try:
-        result = await powerbi_service.refresh_axia_dataset()
-        return result
-    except Exception as e:
-        logger.error(f"Refresh error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# Analysis Endpoints
-
-@app.post("/api/analysis/analyze")
-async def analyze_data(request: DataAnalysisRequest):
-    """Analyze data using AI"""
-    try:
-        analysis = await azure_ai_service.analyze_data(
-            data=request.data,
-            analysis_type=request.analysis_type,
-            user_question=request.question
-        )
-
-        return {
-            "analysis": analysis,
-            "analysis_type": request.analysis_type,
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Analysis error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/api/stats/models")
-async def get_model_statistics():
-    """Get statistics about model usage"""
-    stats = azure_ai_service.get_model_stats()
-    return {
-        "statistics": stats,
-        "models_available": list(settings.GPT5_MODELS.keys()),
-        "timestamp": datetime.now().isoformat()
-    }
-
-
-@app.get("/api/stats/connections")
-async def get_connection_statistics():
-    """Get WebSocket connection statistics"""
-    return websocket_manager.connection_manager.get_connection_stats()
-
-
-# WebSocket Endpoint
-
-@app.websocket("/ws/chat")
-async def websocket_chat(websocket: WebSocket):
-    """WebSocket endpoint for real-time chat about Axia data"""
-    client_id = None
-
-    try:
-        # Accept connection
-        client_id = await websocket_manager.connection_manager.connect(websocket)
-
-        # Create conversation history for this session
-        conversation_history = []
-
-        # Handle messages
-        await websocket_manager.handle_client_message(
-            websocket=websocket,
-            client_id=client_id,
-            ai_service=azure_ai_service,
-            powerbi_service=powerbi_service,
-            conversation_history=conversation_history
-        )
-
-    except WebSocketDisconnect:
-        if client_id:
-            websocket_manager.connection_manager.disconnect(client_id)
-            logger.info(f"WebSocket client {client_id} disconnected")
-    except Exception as e:
-        logger.error(f"WebSocket error: {str(e)}", exc_info=True)
-        if client_id:
-            websocket_manager.connection_manager.disconnect(client_id)
-
-
-# Webhook Endpoints for Logic Apps and AI Foundry Integration
-
-@app.post("/api/v1/webhook/logic-app")
-async def webhook_logic_app(request: Request):
-    """
-    Main webhook endpoint for Azure Logic Apps
-    Accepts HTTP triggers from Logic Apps workflows
-    """
-    try:
-        body = await request.json()
-        headers = dict(request.headers)
-
-        # Process webhook
-        result = await logic_apps_service.handle_webhook(
-            webhook_type="logic_app",
-            payload=body,
-            headers=headers
-        )
-
-        return JSONResponse(status_code=200, content=result)
-
-    except Exception as e:
-        logger.error(f"Logic App webhook error: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": str(e)}
-        )
-
-
-@app.post("/api/v1/webhook/agent-trigger")
-async def webhook_agent_trigger(request: WebhookRequest):
-    """
-    Webhook endpoint for triggering AI Foundry agents
-    Enables Logic Apps to trigger agent actions
-    """
-    try:
-        # Create or get thread
-        thread_id = await ai_foundry_agent.create_thread({
-            "source": "logic_app",
-            "workflow_id": request.workflow_id
-        })
-
-        # Add user message to thread
-        await ai_foundry_agent.add_message(
-            thread_id=thread_id,
-            role="user",
-            content=request.data.get("message", "Process request")
-        )
-
-        # Create agent configuration
-        agent_config = await ai_foundry_agent.create_agent(
-            name="logic-app-agent",
-            instructions="Process Logic App requests and provide intelligent responses",
-            tools=request.data.get("tools", ["query_powerbi_data", "trigger_logic_app"])
-        )
-
-        # Run agent
-        result = await ai_foundry_agent.run_agent(
-            thread_id=thread_id,
-            agent_config=agent_config,
-            stream=False
-        )
-
-        # Send callback if URL provided
-        if request.callback_url:
-            async with aiohttp.ClientSession() as session:
-                await session.post(request.callback_url, json={
-                    "workflow_id": request.workflow_id,
-                    "result": result
-                })
-
-        return JSONResponse(status_code=200, content={
-            "status": "success",
-            "thread_id": thread_id,
-            "result": result
-        })
-
-    except Exception as e:
-        logger.error(f"Agent trigger webhook error: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": str(e)}
-        )
-
-
-@app.post("/api/v1/webhook/callback")
-async def webhook_callback(request: Request):
-    """
-    Callback endpoint for async responses from Logic Apps
-    """
-    try:
-        body = await request.json()
-        headers = dict(request.headers)
-
-        result = await logic_apps_service.handle_webhook(
-            webhook_type="callback",
-            payload=body,
-            headers=headers
-        )
-
-        return JSONResponse(status_code=200, content=result)
-
-    except Exception as e:
-        logger.error(f"Callback webhook error: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": str(e)}
-        )
-
-
-@app.post("/api/v1/agent/run")
-async def run_agent(request: AgentRequest):
-    """
-    Run an AI Foundry agent with function calling capabilities
-    """
-    try:
-        # Create or get thread
-        thread_id = request.thread_id
-        if not thread_id:
-            thread_id = await ai_foundry_agent.create_thread()
-
-        # Add user message
-        await ai_foundry_agent.add_message(
-            thread_id=thread_id,
-            role="user",
-            content=request.message
-        )
-
-        # Create agent with specified tools
-        agent_config = await ai_foundry_agent.create_agent(
-            name=request.agent_name,
-            instructions=f"You are {request.agent_name}, a helpful AI assistant for analyzing Power BI data and orchestrating workflows.",
-            tools=request.tools
-        )
-
-        # Run the agent
-        result = await ai_foundry_agent.run_agent(
-            thread_id=thread_id,
-            agent_config=agent_config
-        )
-
-        return JSONResponse(status_code=200, content={
-            "thread_id": thread_id,
-            "agent_id": agent_config["id"],
-            "result": result
-        })
-
-    except Exception as e:
-        logger.error(f"Agent run error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/api/v1/logic-app/trigger")
-async def trigger_logic_app(workflow_name: str, payload: Dict[str, Any]):
-    """
-    Trigger a Logic App workflow from the application
-    """
-    try:
-        result = await logic_apps_service.trigger_workflow(
-            workflow_name=workflow_name,
-            payload=payload,
-            wait_for_response=True
-        )
-
-        return JSONResponse(status_code=200, content=result)
-
-    except Exception as e:
-        logger.error(f"Logic App trigger error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/api/v1/logic-app/status/{workflow_id}")
-async def get_workflow_status(workflow_id: str):
-    """Get Logic App workflow execution status"""
-    try:
-        status = await logic_apps_service.get_workflow_status(workflow_id)
-        return JSONResponse(status_code=200, content=status)
-
-    except Exception as e:
-        logger.error(f"Workflow status error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+# Routers
+app.include_router(health.router)
+app.include_router(chat.router)
+app.include_router(powerbi.router)
+app.include_router(analysis.router)
+app.include_router(webhooks.router)
 
 
 # Error Handlers
@@ -684,4 +121,4 @@ if __name__ == "__main__":
         port=settings.APP_PORT,
         reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower()
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,5 @@
+"""API routers for Seekapa Copilot"""
+
+from . import analysis, chat, health, powerbi, webhooks
+
+__all__ = ["analysis", "chat", "health", "powerbi", "webhooks"]
@@ -0,0 +1,65 @@
+"""
+Analysis Endpoints
+AI data analysis and usage statistics
+"""
+
+from datetime import datetime
+from typing import Optional, Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from app.config import settings
+from app.dependencies import get_azure_ai_service, get_websocket_manager
+from app.services.azure_ai import AzureAIService
+from app.services.websocket import WebSocketManager
+
+router = APIRouter()
+
+
+class DataAnalysisRequest(BaseModel):
+    """Data analysis request model"""
+    data: Any = Field(..., description="Data to analyze")
+    analysis_type: str = Field("general", description="Type of analysis: general, trend, anomaly, forecast")
+    question: Optional[str] = Field(None, description="Specific question about the data")
+
+
+@router.post("/api/analysis/analyze")
+async def analyze_data(
+    request: DataAnalysisRequest,
+    azure_ai_service: AzureAIService = Depends(get_azure_ai_service)
+):
+    """Analyze data using AI"""
+    try:
+        analysis = await azure_ai_service.analyze_data(
+            data=request.data,
+            analysis_type=request.analysis_type,
+            user_question=request.question
+        )
+
+        return {
+            "analysis": analysis,
+            "analysis_type": request.analysis_type,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/api/stats/models")
+async def get_model_statistics(azure_ai_service: AzureAIService = Depends(get_azure_ai_service)):
+    """Get statistics about model usage"""
+    stats = azure_ai_service.get_model_stats()
+    return {
+        "statistics": stats,
+        "models_available": list(settings.GPT5_MODELS.keys()),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.get("/api/stats/connections")
+async def get_connection_statistics(websocket_manager: WebSocketManager = Depends(get_websocket_manager)):
+    """Get WebSocket connection statistics"""
+    return websocket_manager.connection_manager.get_connection_stats()
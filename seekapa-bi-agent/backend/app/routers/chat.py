@@ -0,0 +1,123 @@
+"""
+Chat Endpoints
+REST and WebSocket chat about the DS-Axia dataset
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from app.dependencies import (
+    conversations,
+    get_azure_ai_service,
+    get_powerbi_service,
+    get_websocket_manager,
+)
+from app.services.azure_ai import AzureAIService
+from app.services.powerbi import PowerBIService
+from app.services.websocket import WebSocketManager
+
+router = APIRouter()
+
+
+class ChatMessage(BaseModel):
+    """Chat message model"""
+    content: str = Field(..., description="Message content")
+    context: Optional[Dict[str, Any]] = Field(None, description="Additional context")
+    conversation_id: Optional[str] = Field(None, description="Conversation ID for context")
+    stream: bool = Field(False, description="Whether to stream the response")
+
+
+@router.post("/api/chat")
+async def chat(
+    message: ChatMessage,
+    azure_ai_service: AzureAIService = Depends(get_azure_ai_service)
+):
+    """Chat endpoint for non-WebSocket interactions"""
+    try:
+        # Get or create conversation
+        conversation_id = message.conversation_id or str(uuid.uuid4())
+        if conversation_id not in conversations:
+            conversations[conversation_id] = []
+
+        # Build messages
+        messages = [{"role": "user", "content": message.content}]
+
+        # Add conversation history
+        if conversations[conversation_id]:
+            for turn in conversations[conversation_id][-3:]:
+                messages.insert(0, {"role": "assistant", "content": turn["assistant"]})
+                messages.insert(0, {"role": "user", "content": turn["user"]})
+
+        # Get AI response
+        response = await azure_ai_service.call_gpt5(
+            messages=messages,
+            query=message.content,
+            context=message.context,
+            stream=False,
+            conversation_history=conversations[conversation_id]
+        )
+
+        # Store in conversation history
+        conversations[conversation_id].append({
+            "user": message.content,
+            "assistant": response,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        # Get model stats
+        model_stats = azure_ai_service.model_selector.analyze_query_complexity(message.content)
+
+        return {
+            "response": response,
+            "conversation_id": conversation_id,
+            "model_info": {
+                "complexity": model_stats[0],
+                "confidence": model_stats[1]
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Chat error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.websocket("/ws/chat")
+async def websocket_chat(
+    websocket: WebSocket,
+    websocket_manager: WebSocketManager = Depends(get_websocket_manager),
+    azure_ai_service: AzureAIService = Depends(get_azure_ai_service),
+    powerbi_service: PowerBIService = Depends(get_powerbi_service)
+):
+    """WebSocket endpoint for real-time chat about Axia data"""
+    client_id = None
+
+    try:
+        # Accept connection
+        client_id = await websocket_manager.connection_manager.connect(websocket)
+
+        # Create conversation history for this session
+        conversation_history = []
+
+        # Handle messages
+        await websocket_manager.handle_client_message(
+            websocket=websocket,
+            client_id=client_id,
+            ai_service=azure_ai_service,
+            powerbi_service=powerbi_service,
+            conversation_history=conversation_history
+        )
+
+    except WebSocketDisconnect:
+        if client_id:
+            websocket_manager.connection_manager.disconnect(client_id)
+            logger.info(f"WebSocket client {client_id} disconnected")
+    except Exception as e:
+        logger.error(f"WebSocket error: {str(e)}", exc_info=True)
+        if client_id:
+            websocket_manager.connection_manager.disconnect(client_id)
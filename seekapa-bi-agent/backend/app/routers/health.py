@@ -0,0 +1,144 @@
+"""
+Health Endpoints
+Application info and service health checks
+"""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from loguru import logger
+
+from app.config import settings
+from app.dependencies import (
+    get_ai_foundry_agent,
+    get_logic_apps_service,
+    get_websocket_manager,
+)
+from app.services.ai_foundry_agent import AIFoundryAgent
+from app.services.logic_apps import LogicAppsService
+from app.services.websocket import WebSocketManager
+
+router = APIRouter()
+
+
+@router.get("/")
+async def root():
+    """Root endpoint with application information"""
+    return {
+        "name": settings.APP_NAME,
+        "version": settings.APP_VERSION,
+        "dataset": settings.POWERBI_AXIA_DATASET_NAME,
+        "dataset_id": settings.POWERBI_AXIA_DATASET_ID,
+        "status": "ready",
+        "style": "Microsoft Copilot for Power BI",
+        "endpoints": {
+            "docs": "/docs",
+            "health": "/health",
+            "websocket": "/ws/chat",
+            "api": {
+                "chat": "/api/chat",
+                "powerbi": "/api/powerbi/*",
+                "analysis": "/api/analysis/*"
+            }
+        }
+    }
+
+
+@router.get("/health")
+async def health_check(websocket_manager: WebSocketManager = Depends(get_websocket_manager)):
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "services": {
+            "azure_ai": "operational",
+            "powerbi": "operational",
+            "websocket": "operational",
+            "ai_foundry": "operational",
+            "logic_apps": "operational"
+        },
+        "connections": websocket_manager.connection_manager.get_connection_stats()
+    }
+
+
+@router.get("/api/v1/health/logic-app")
+async def health_check_logic_apps(logic_apps_service: LogicAppsService = Depends(get_logic_apps_service)):
+    """Health check for Logic Apps connectivity"""
+    try:
+        result = await logic_apps_service.test_connection()
+        return JSONResponse(
+            status_code=200 if result["status"] != "error" else 503,
+            content={
+                "service": "Azure Logic Apps",
+                "status": result["status"],
+                "details": result,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+    except Exception as e:
+        logger.error(f"Logic Apps health check error: {e}")
+        return JSONResponse(
+            status_code=503,
+            content={
+                "service": "Azure Logic Apps",
+                "status": "error",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+
+
+@router.get("/api/v1/health/ai-foundry")
+async def health_check_ai_foundry(ai_foundry_agent: AIFoundryAgent = Depends(get_ai_foundry_agent)):
+    """Health check for AI Foundry agent service"""
+    try:
+        # Test by creating a temporary thread
+        test_thread = await ai_foundry_agent.create_thread({"health_check": True})
+        await ai_foundry_agent.delete_thread(test_thread)
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "service": "Azure AI Foundry",
+                "status": "operational",
+                "endpoint": ai_foundry_agent.endpoint,
+                "project": ai_foundry_agent.project,
+                "agent_id": ai_foundry_agent.agent_id,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+    except Exception as e:
+        logger.error(f"AI Foundry health check error: {e}")
+        return JSONResponse(
+            status_code=503,
+            content={
+                "service": "Azure AI Foundry",
+                "status": "error",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+
+
+@router.get("/api/v1/health/webhook")
+async def health_check_webhook():
+    """Validate webhook configuration"""
+    webhook_config = {
+        "logic_app_url": bool(settings.AZURE_LOGIC_APP_URL),
+        "logic_app_key": bool(settings.AZURE_LOGIC_APP_KEY),
+        "ai_foundry_endpoint": bool(settings.AZURE_AI_FOUNDRY_ENDPOINT),
+        "callback_url": f"{settings.APP_BASE_URL}/api/v1/webhook/callback"
+    }
+
+    all_configured = all(webhook_config.values())
+
+    return JSONResponse(
+        status_code=200 if all_configured else 503,
+        content={
+            "service": "Webhook Configuration",
+            "status": "configured" if all_configured else "incomplete",
+            "configuration": webhook_config,
+            "timestamp": datetime.now().isoformat()
+        }
+    )
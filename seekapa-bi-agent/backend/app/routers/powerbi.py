@@ -0,0 +1,118 @@
+"""
+Power BI Endpoints
+DS-Axia dataset info, DAX queries and refreshes
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from app.config import settings
+from app.dependencies import get_azure_ai_service, get_powerbi_service
+from app.services.azure_ai import AzureAIService
+from app.services.powerbi import PowerBIService
+
+router = APIRouter()
+
+
+class DAXQuery(BaseModel):
+    """DAX query model"""
+    query: str = Field(..., description="DAX query to execute")
+    format: Optional[str] = Field("json", description="Response format (json/csv)")
+
+
+class NaturalLanguageQuery(BaseModel):
+    """Natural language query for DAX generation"""
+    question: str = Field(..., description="Natural language question about the data")
+    include_explanation: bool = Field(True, description="Include explanation with the query")
+
+
+@router.get("/api/powerbi/axia/info")
+async def get_axia_info(powerbi_service: PowerBIService = Depends(get_powerbi_service)):
+    """Get DS-Axia dataset information"""
+    try:
+        dataset_details = await powerbi_service.get_axia_dataset_details()
+        tables = await powerbi_service.get_axia_tables()
+        refresh_history = await powerbi_service.get_refresh_history()
+        reports = await powerbi_service.get_reports_using_axia()
+
+        return {
+            "dataset": settings.POWERBI_AXIA_DATASET_NAME,
+            "dataset_id": settings.POWERBI_AXIA_DATASET_ID,
+            "details": dataset_details,
+            "tables": tables,
+            "refresh_history": refresh_history,
+            "reports": reports,
+            "workspace_id": settings.POWERBI_WORKSPACE_ID
+        }
+    except Exception as e:
+        logger.error(f"Error getting Axia info: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/powerbi/axia/query")
+async def query_axia_data(
+    query: DAXQuery,
+    powerbi_service: PowerBIService = Depends(get_powerbi_service)
+):
+    """Execute DAX query on DS-Axia dataset"""
+    try:
+        result = await powerbi_service.query_axia_data(query.query)
+
+        if query.format == "csv" and result.get("success"):
+            # Convert to CSV format
+            import csv
+            import io
+
+            output = io.StringIO()
+            if result.get("data"):
+                writer = csv.DictWriter(output, fieldnames=result["columns"])
+                writer.writeheader()
+                writer.writerows(result["data"])
+
+            return StreamingResponse(
+                io.StringIO(output.getvalue()),
+                media_type="text/csv",
+                headers={"Content-Disposition": f"attachment; filename=axia_query_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"}
+            )
+
+        return result
+    except Exception as e:
+        logger.error(f"Query error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/powerbi/axia/query/natural")
+async def natural_language_to_dax(
+    query: NaturalLanguageQuery,
+    azure_ai_service: AzureAIService = Depends(get_azure_ai_service),
+    powerbi_service: PowerBIService = Depends(get_powerbi_service)
+):
+    """Convert natural language to DAX query"""
+    try:
+        result = await azure_ai_service.generate_dax_query(query.question)
+
+        # If DAX was generated, try to execute it
+        if result.get("dax_query") and not result.get("error"):
+            execution_result = await powerbi_service.query_axia_data(result["dax_query"])
+            result["execution_result"] = execution_result
+
+        return result
+    except Exception as e:
+        logger.error(f"Natural language query error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/powerbi/axia/refresh")
+async def refresh_axia_dataset(powerbi_service: PowerBIService = Depends(get_powerbi_service)):
+    """Trigger a refresh of the DS-Axia dataset"""
+    try:
+        result = await powerbi_service.refresh_axia_dataset()
+        return result
+    except Exception as e:
+        logger.error(f"Refresh error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
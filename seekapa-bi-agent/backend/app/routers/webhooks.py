@@ -0,0 +1,234 @@
+"""
+Webhook Endpoints
+Logic Apps and AI Foundry integration
+"""
+
+from typing import Optional, List, Dict, Any
+
+import aiohttp
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from app.dependencies import get_ai_foundry_agent, get_logic_apps_service
+from app.services.ai_foundry_agent import AIFoundryAgent
+from app.services.logic_apps import LogicAppsService
+
+router = APIRouter()
+
+
+class WebhookRequest(BaseModel):
+    """Webhook request model for Logic Apps"""
+    action: str = Field(..., description="Action to perform")
+    data: Dict[str, Any] = Field(..., description="Action data")
+    workflow_id: Optional[str] = Field(None, description="Workflow ID for callbacks")
+    callback_url: Optional[str] = Field(None, description="Callback URL for async responses")
+
+
+class AgentRequest(BaseModel):
+    """Agent request model"""
+    message: str = Field(..., description="User message")
+    thread_id: Optional[str] = Field(None, description="Thread ID for conversation continuity")
+    agent_name: Optional[str] = Field("seekapa-copilot", description="Agent name to use")
+    tools: Optional[List[str]] = Field(None, description="Tools to enable for agent")
+
+
+@router.post("/api/v1/webhook/logic-app")
+async def webhook_logic_app(
+    request: Request,
+    logic_apps_service: LogicAppsService = Depends(get_logic_apps_service)
+):
+    """
+    Main webhook endpoint for Azure Logic Apps
+    Accepts HTTP triggers from Logic Apps workflows
+    """
+    try:
+        body = await request.json()
+        headers = dict(request.headers)
+
+        # Process webhook
+        result = await logic_apps_service.handle_webhook(
+            webhook_type="logic_app",
+            payload=body,
+            headers=headers
+        )
+
+        return JSONResponse(status_code=200, content=result)
+
+    except Exception as e:
+        logger.error(f"Logic App webhook error: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@router.post("/api/v1/webhook/agent-trigger")
+async def webhook_agent_trigger(
+    request: WebhookRequest,
+    ai_foundry_agent: AIFoundryAgent = Depends(get_ai_foundry_agent)
+):
+    """
+    Webhook endpoint for triggering AI Foundry agents
+    Enables Logic Apps to trigger agent actions
+    """
+    try:
+        # Create or get thread
+        thread_id = await ai_foundry_agent.create_thread({
+            "source": "logic_app",
+            "workflow_id": request.workflow_id
+        })
+
+        # Add user message to thread
+        await ai_foundry_agent.add_message(
+            thread_id=thread_id,
+            role="user",
+            content=request.data.get("message", "Process request")
+        )
+
+        # Create agent configuration
+        agent_config = await ai_foundry_agent.create_agent(
+            name="logic-app-agent",
+            instructions="Process Logic App requests and provide intelligent responses",
+            tools=request.data.get("tools", ["query_powerbi_data", "trigger_logic_app"])
+        )
+
+        # Run agent
+        result = await ai_foundry_agent.run_agent(
+            thread_id=thread_id,
+            agent_config=agent_config,
+            stream=False
+        )
+
+        # Send callback if URL provided
+        if request.callback_url:
+            async with aiohttp.ClientSession() as session:
+                await session.post(request.callback_url, json={
+                    "workflow_id": request.workflow_id,
+                    "result": result
+                })
+
+        return JSONResponse(status_code=200, content={
+            "status": "success",
+            "thread_id": thread_id,
+            "result": result
+        })
+
+    except Exception as e:
+        logger.error(f"Agent trigger webhook error: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@router.post("/api/v1/webhook/callback")
+async def webhook_callback(
+    request: Request,
+    logic_apps_service: LogicAppsService = Depends(get_logic_apps_service)
+):
+    """
+    Callback endpoint for async responses from Logic Apps
+    """
+    try:
+        body = await request.json()
+        headers = dict(request.headers)
+
+        result = await logic_apps_service.handle_webhook(
+            webhook_type="callback",
+            payload=body,
+            headers=headers
+        )
+
+        return JSONResponse(status_code=200, content=result)
+
+    except Exception as e:
+        logger.error(f"Callback webhook error: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+@router.post("/api/v1/agent/run")
+async def run_agent(
+    request: AgentRequest,
+    ai_foundry_agent: AIFoundryAgent = Depends(get_ai_foundry_agent)
+):
+    """
+    Run an AI Foundry agent with function calling capabilities
+    """
+    try:
+        # Create or get thread
+        thread_id = request.thread_id
+        if not thread_id:
+            thread_id = await ai_foundry_agent.create_thread()
+
+        # Add user message
+        await ai_foundry_agent.add_message(
+            thread_id=thread_id,
+            role="user",
+            content=request.message
+        )
+
+        # Create agent with specified tools
+        agent_config = await ai_foundry_agent.create_agent(
+            name=request.agent_name,
+            instructions=f"You are {request.agent_name}, a helpful AI assistant for analyzing Power BI data and orchestrating workflows.",
+            tools=request.tools
+        )
+
+        # Run the agent
+        result = await ai_foundry_agent.run_agent(
+            thread_id=thread_id,
+            agent_config=agent_config
+        )
+
+        return JSONResponse(status_code=200, content={
+            "thread_id": thread_id,
+            "agent_id": agent_config["id"],
+            "result": result
+        })
+
+    except Exception as e:
+        logger.error(f"Agent run error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/v1/logic-app/trigger")
+async def trigger_logic_app(
+    workflow_name: str,
+    payload: Dict[str, Any],
+    logic_apps_service: LogicAppsService = Depends(get_logic_apps_service)
+):
+    """
+    Trigger a Logic App workflow from the application
+    """
+    try:
+        result = await logic_apps_service.trigger_workflow(
+            workflow_name=workflow_name,
+            payload=payload,
+            wait_for_response=True
+        )
+
+        return JSONResponse(status_code=200, content=result)
+
+    except Exception as e:
+        logger.error(f"Logic App trigger error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/api/v1/logic-app/status/{workflow_id}")
+async def get_workflow_status(
+    workflow_id: str,
+    logic_apps_service: LogicAppsService = Depends(get_logic_apps_service)
+):
+    """Get Logic App workflow execution status"""
+    try:
+        status = await logic_apps_service.get_workflow_status(workflow_id)
+        return JSONResponse(status_code=200, content=status)
+
+    except Exception as e:
+        logger.error(f"Workflow status error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
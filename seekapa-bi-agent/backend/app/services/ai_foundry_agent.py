@@ -51,6 +51,7 @@ class AIFoundryAgent:
         """Cleanup resources"""
         if self.session:
             await self.session.close()
+            self.session = None
 
     async def _register_default_functions(self):
         """Register default functions for the agent"""
@@ -119,21 +119,83 @@ class AuditLogger:
         self.processing = True
         self._start_background_processor()
 
-    def _calculate_event_hash(self, event: AuditEvent) -> str:
-        """Calculate integrity hash for audit event"""
+    def _calculate_event_hash(self, event: AuditEvent, last_hash: Optional[str] = None) -> str:
+        """Calculate integrity hash for audit event, chained to last_hash (read from Redis if omitted)"""
         # Create a deterministic string representation
         hash_data = f"{event.event_id}:{event.timestamp.isoformat()}:{event.event_type}:{event.action}:{event.result}"
         if event.user_id:
             hash_data += f":{event.user_id}"
 
         # Add previous event hash for chain integrity
-        last_hash = self.redis_client.get("audit:last_hash")
+        if last_hash is None:
+            last_hash = self.redis_client.get("audit:last_hash")
         if last_hash:
             hash_data += f":{last_hash}"
 
         # Calculate SHA-256 hash
         return hashlib.sha256(hash_data.encode()).hexdigest()
 
+    def _store_event(self, store, event: AuditEvent):
+        """Write an event and its indexes to a Redis client or pipeline"""
+        ttl = self.retention_days * 86400
+
+        # Store in Redis with expiration
+        store.setex(f"audit:event:{event.event_id}", ttl, event.model_dump_json())
+
+        # Update last hash for chain integrity
+        store.set("audit:last_hash", event.hash)
+
+        # Add to processing queue
+        store.lpush("audit:queue", event.event_id)
+
+        # Add to user's audit trail
+        if event.user_id:
+            user_key = f"audit:user:{event.user_id}"
+            store.zadd(user_key, {event.event_id: event.timestamp.timestamp()})
+            store.expire(user_key, ttl)
+
+        # Add to daily index for compliance reporting
+        date_key = f"audit:date:{event.timestamp.date().isoformat()}"
+        store.zadd(date_key, {event.event_id: event.timestamp.timestamp()})
+        store.expire(date_key, ttl)
+
+    def _build_event(
+        self,
+        event_type: AuditEventType,
+        action: str,
+        result: str = "success",
+        severity: AuditSeverity = AuditSeverity.INFO,
+        user_id: Optional[str] = None,
+        username: Optional[str] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+        data_classification: Optional[str] = None,
+        compliance_tags: Optional[List[str]] = None
+    ) -> AuditEvent:
+        """Create an audit event; event_id, timestamp and hash are always assigned here"""
+        return AuditEvent(
+            event_type=event_type,
+            severity=severity,
+            user_id=user_id,
+            username=username,
+            session_id=session_id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            action=action,
+            result=result,
+            details=details or {},
+            error_message=error_message,
+            data_classification=data_classification,
+            compliance_tags=compliance_tags or []
+        )
+
     async def log_event(
         self,
         event_type: AuditEventType,
@@ -155,8 +217,10 @@ class AuditLogger:
         """Log an audit event with full SOC 2 compliance"""
         try:
             # Create audit event
-            event = AuditEvent(
+            event = self._build_event(
                 event_type=event_type,
+                action=action,
+                result=result,
                 severity=severity,
                 user_id=user_id,
                 username=username,
@@ -165,47 +229,17 @@ class AuditLogger:
                 user_agent=user_agent,
                 resource_type=resource_type,
                 resource_id=resource_id,
-                action=action,
-                result=result,
-                details=details or {},
+                details=details,
                 error_message=error_message,
                 data_classification=data_classification,
-                compliance_tags=compliance_tags or []
+                compliance_tags=compliance_tags
             )
 
             # Calculate integrity hash
             event.hash = self._calculate_event_hash(event)
 
-            # Store in Redis with expiration
-            event_key = f"audit:event:{event.event_id}"
-            self.redis_client.setex(
-                event_key,
-                self.retention_days * 86400,
-                event.model_dump_json()
-            )
-
-            # Update last hash for chain integrity
-            self.redis_client.set("audit:last_hash", event.hash)
-
-            # Add to processing queue
-            self.redis_client.lpush("audit:queue", event.event_id)
-
-            # Add to user's audit trail
-            if user_id:
-                user_key = f"audit:user:{user_id}"
-                self.redis_client.zadd(
-                    user_key,
-                    {event.event_id: event.timestamp.timestamp()}
-                )
-                self.redis_client.expire(user_key, self.retention_days * 86400)
-
-            # Add to daily index for compliance reporting
-            date_key = f"audit:date:{event.timestamp.date().isoformat()}"
-            self.redis_client.zadd(
-                date_key,
-                {event.event_id: event.timestamp.timestamp()}
-            )
-            self.redis_client.expire(date_key, self.retention_days * 86400)
+            # Store event and indexes
+            self._store_event(self.redis_client, event)
 
             # Log critical events immediately
             if severity in [AuditSeverity.HIGH, AuditSeverity.CRITICAL]:
@@ -219,6 +253,50 @@ class AuditLogger:
             # Fall back to file logging for critical events
             self._fallback_log(event_type, action, str(e))
 
+    async def log_events(self, events: List[Dict[str, Any]]):
+        """
+        Log several audit events in one Redis round-trip
+
+        Each item takes the same keyword arguments as log_event; unknown keys
+        and the protected event_id, timestamp and hash fields raise TypeError
+        before anything is stored. Events are hash-chained in order, then
+        written through a single pipeline.
+        """
+        if not events:
+            return
+
+        # Omitted and None arguments both fall back to log_event's defaults
+        audit_events = [
+            self._build_event(**{key: value for key, value in fields.items() if value is not None})
+            for fields in events
+        ]
+
+        try:
+            # Chain hashes locally from the last stored hash
+            last_hash = self.redis_client.get("audit:last_hash")
+            for event in audit_events:
+                event.hash = self._calculate_event_hash(event, last_hash or "")
+                last_hash = event.hash
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for event in audit_events:
+                self._store_event(pipe, event)
+            pipe.execute()
+
+            # Log critical events immediately
+            for event in audit_events:
+                if event.severity in [AuditSeverity.HIGH, AuditSeverity.CRITICAL]:
+                    await self._send_to_external(event)
+                    logger.warning(f"Critical audit event: {event.event_type} - {event.action}")
+
+            logger.debug(f"Audit events logged: {len(audit_events)}")
+
+        except Exception as e:
+            logger.error(f"Failed to log audit events: {str(e)}")
+            # Fall back to file logging for critical events
+            for event in audit_events:
+                self._fallback_log(event.event_type, event.action, str(e))
+
     def _fallback_log(self, event_type: str, action: str, error: str):
         """Fallback logging to file when Redis fails"""
         try:
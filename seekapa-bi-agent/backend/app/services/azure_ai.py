@@ -35,6 +35,7 @@ class AzureAIService:
         """Cleanup resources"""
         if self.session:
             await self.session.close()
+            self.session = None
 
     async def call_gpt5(
         self,
@@ -0,0 +1,154 @@
+"""
+Shared HTTP Session Pool
+Process-wide aiohttp ClientSession reused by the outbound REST services
+so keep-alive connections survive across service instances, plus an
+opt-in HTTP/2 session with the same request surface
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+# Holders per session; a session replaced for another loop keeps its own count
+_session_refs: Dict[aiohttp.ClientSession, int] = {}
+
+
+def _build_session() -> aiohttp.ClientSession:
+    """Create the pooled session with a tuned connector"""
+    connector = aiohttp.TCPConnector(
+        limit=settings.AIOHTTP_SESSION_LIMIT,
+        limit_per_host=settings.AIOHTTP_SESSION_LIMIT_PER_HOST,
+        ttl_dns_cache=20,
+        enable_cleanup_closed=True
+    )
+    timeout = aiohttp.ClientTimeout(total=settings.AIOHTTP_SESSION_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Acquire a reference to the shared ClientSession
+
+    The session is built lazily and rebuilt when it was closed or belongs to
+    another event loop (e.g. a fresh loop per test). A replaced session stays
+    open for its remaining holders. Construction never awaits, so the
+    check-and-set cannot interleave with another caller.
+
+    Returns:
+        The shared aiohttp ClientSession
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and _session.closed:
+            _session_refs.pop(_session, None)
+        _session = _build_session()
+        _session_loop = loop
+        logger.debug("Created shared aiohttp session")
+
+    _session_refs[_session] = _session_refs.get(_session, 0) + 1
+    return _session
+
+
+async def release_shared_session(session: aiohttp.ClientSession) -> None:
+    """
+    Release a reference taken with get_shared_session
+
+    A session is closed once its last holder releases it, whether or not it
+    is still the current shared one. Sessions the pool never handed out
+    (such as an HTTP2Session) are closed directly.
+    """
+    global _session, _session_loop
+
+    refs = _session_refs.get(session, 0) - 1
+    if refs > 0:
+        _session_refs[session] = refs
+        return
+
+    _session_refs.pop(session, None)
+    if session is _session:
+        _session = None
+        _session_loop = None
+    if not session.closed:
+        await session.close()
+        logger.debug("Closed shared aiohttp session")
+
+
+class _HTTPXResponse:
+    """aiohttp-style view (status, json(), text()) of a buffered httpx response"""
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+
+    @property
+    def status(self) -> int:
+        return self._response.status_code
+
+    async def json(self) -> Any:
+        return self._response.json()
+
+    async def text(self) -> str:
+        return self._response.text
+
+
+class HTTP2Session:
+    """
+    Minimal aiohttp.ClientSession stand-in backed by an HTTP/2 httpx client
+
+    Concurrent requests to one host are multiplexed over a single connection.
+    Only the get/post context-manager surface the REST services use is provided.
+    """
+
+    def __init__(self):
+        limits = httpx.Limits(
+            max_connections=settings.AIOHTTP_SESSION_LIMIT_PER_HOST,
+            max_keepalive_connections=settings.AIOHTTP_SESSION_LIMIT_PER_HOST
+        )
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
+            timeout=settings.AIOHTTP_SESSION_TIMEOUT
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._client.is_closed
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: Any = None,
+        json: Any = None,
+        headers: Optional[dict] = None
+    ) -> AsyncIterator[_HTTPXResponse]:
+        # Pre-encoded bodies go out verbatim; dicts are form-encoded as in aiohttp
+        content = data if isinstance(data, (bytes, str)) else None
+        form = None if content is not None else data
+        response = await self._client.request(
+            method, url, content=content, data=form, json=json, headers=headers
+        )
+        yield _HTTPXResponse(response)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        await self._client.aclose()
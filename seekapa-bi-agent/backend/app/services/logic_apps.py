@@ -53,6 +53,7 @@ class LogicAppsService:
         """Cleanup resources"""
         if self.session:
             await self.session.close()
+            self.session = None
 
     async def _register_default_webhooks(self):
         """Register default webhook endpoints"""
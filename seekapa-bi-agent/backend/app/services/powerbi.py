@@ -6,14 +6,29 @@ Specifically designed for DS-Axia dataset integration
 
 import aiohttp
 import asyncio
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import copy
+import time
+from cachetools import TTLCache
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Union
+from urllib.parse import urlencode
 import logging
 import json
 from app.config import settings
+from app.services.http_pool import HTTP2Session, get_shared_session, release_shared_session
 
 logger = logging.getLogger(__name__)
 
+TOKEN_REQUEST_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+# Cached tokens expire this long before Azure AD's deadline, covering the
+# round-trip between Azure AD stamping expires_in and us reading it
+TOKEN_EXPIRY_SKEW_SECONDS = 60
+# The background refresh renews this long before the cached deadline, so requests
+# arriving while the renewal is in flight still hit the cache
+TOKEN_REFRESH_LEAD_SECONDS = 60
+TOKEN_REFRESH_RETRY_SECONDS = 30
+
 
 class PowerBIService:
     """Service for interacting with Power BI REST API"""
@@ -25,19 +40,78 @@ class PowerBIService:
             "expires": None,
             "refresh_token": None
         }
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.dataset_cache = {}
+        self.session: Optional[Union[aiohttp.ClientSession, HTTP2Session]] = None
+        self.dataset_cache: TTLCache = TTLCache(
+            maxsize=self.settings.DATASET_CACHE_SIZE,
+            ttl=self.settings.DATASET_CACHE_TTL
+        )
+        self._refresh_inflight: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._token_ready = asyncio.Event()
+        self._dax_inflight: Dict[str, asyncio.Task] = {}
+
+        # Endpoint URLs depend only on settings, so build them once
+        workspace_url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}"
+        self._token_url = f"{self.settings.POWERBI_AUTHORITY}/oauth2/v2.0/token"
+        self._dataset_url = f"{workspace_url}/datasets/{self.settings.POWERBI_AXIA_DATASET_ID}"
+        self._dax_url = f"{self._dataset_url}/executeQueries"
+        self._tables_url = f"{self._dataset_url}/tables"
+        self._refreshes_url = f"{self._dataset_url}/refreshes"
+        self._reports_url = f"{workspace_url}/reports"
+
+        # The client credentials request never changes, so urlencode it once
+        self._token_post_body = urlencode({
+            'client_id': self.settings.POWERBI_CLIENT_ID,
+            'client_secret': self.settings.POWERBI_CLIENT_SECRET,
+            'scope': self.settings.POWERBI_SCOPE,
+            'grant_type': 'client_credentials'
+        }).encode('ascii')
 
     async def initialize(self):
         """Initialize the service"""
         if not self.session:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            if self.settings.POWERBI_HTTP2:
+                self.session = HTTP2Session()
+            else:
+                self.session = await get_shared_session()
+        if self._refresh_task is None or self._refresh_task.done():
+            # Event bound to the loop the refresh task runs on
+            self._token_ready = asyncio.Event()
+            if self.token_cache["token"]:
+                self._token_ready.set()
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
 
     async def cleanup(self):
         """Cleanup resources"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+        # Stop in-flight requests before their session is closed under them
+        inflight = list(self._dax_inflight.values())
+        if self._refresh_inflight:
+            inflight.append(self._refresh_inflight)
+            self._refresh_inflight = None
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+
         if self.session:
-            await self.session.close()
+            # An HTTP/2 session is not the shared one, so release just closes it
+            await release_shared_session(self.session)
+            self.session = None
+
+    def reset(self):
+        """Drop cached tokens, dataset details and in-flight request handles"""
+        self.token_cache.update(token=None, expires=None, refresh_token=None)
+        self._token_ready.clear()
+        self.dataset_cache.clear()
+        self._dax_inflight.clear()
+        self._refresh_inflight = None
 
     async def get_access_token(self) -> str:
         """
@@ -46,36 +120,73 @@ class PowerBIService:
         Returns:
             Access token string
         """
-        # Check if we have a valid cached token
-        if (self.token_cache["token"] and
-            self.token_cache["expires"] and
-            datetime.now() < self.token_cache["expires"]):
+        # Check if we have a valid cached token (expires is a monotonic deadline)
+        token = self.token_cache["token"]
+        expires = self.token_cache["expires"]
+        if token and expires and time.monotonic() < expires:
             logger.debug("Using cached Power BI token")
-            return self.token_cache["token"]
+            return token
+
+        return await self._refresh_access_token()
+
+    async def _refresh_access_token(self) -> str:
+        """
+        Fetch a new token, sharing one in-flight request between callers
+
+        Returns:
+            Access token string
+        """
+        # Concurrent callers share one in-flight refresh instead of each POSTing
+        if self._refresh_inflight is None or self._refresh_inflight.done():
+            self._refresh_inflight = asyncio.create_task(self._request_access_token())
+
+        # Shield so a cancelled caller does not abort the refresh for the others
+        return await asyncio.shield(self._refresh_inflight)
+
+    async def _refresh_loop(self):
+        """Refresh the token ahead of its deadline so requests stay on the cache"""
+        while True:
+            # The first token is fetched on demand; only renewals happen here
+            await self._token_ready.wait()
+
+            # Renew ahead of the cached deadline; the floor keeps a short-lived
+            # token from turning this into a tight request loop
+            expires = self.token_cache["expires"] or time.monotonic()
+            renew_in = expires - TOKEN_REFRESH_LEAD_SECONDS - time.monotonic()
+            await asyncio.sleep(max(TOKEN_REFRESH_RETRY_SECONDS, renew_in))
+
+            try:
+                await self._refresh_access_token()
+            except Exception:
+                # Already logged; get_access_token still refreshes on demand
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_SECONDS)
+
+    async def _request_access_token(self) -> str:
+        """
+        Request a new access token from Azure AD and cache it
 
+        Returns:
+            Access token string
+        """
         logger.info("Requesting new Power BI access token")
 
         if not self.session:
             await self.initialize()
 
-        token_url = f"{self.settings.POWERBI_AUTHORITY}/oauth2/v2.0/token"
-
-        data = {
-            'client_id': self.settings.POWERBI_CLIENT_ID,
-            'client_secret': self.settings.POWERBI_CLIENT_SECRET,
-            'scope': self.settings.POWERBI_SCOPE,
-            'grant_type': 'client_credentials'
-        }
-
         try:
-            async with self.session.post(token_url, data=data) as response:
+            async with self.session.post(
+                self._token_url,
+                data=self._token_post_body,
+                headers=TOKEN_REQUEST_HEADERS
+            ) as response:
                 if response.status == 200:
                     token_data = await response.json()
 
                     # Cache the token
                     self.token_cache["token"] = token_data['access_token']
                     expires_in = token_data.get('expires_in', 3600)
-                    self.token_cache["expires"] = datetime.now() + timedelta(seconds=expires_in - 60)
+                    self.token_cache["expires"] = time.monotonic() + expires_in - TOKEN_EXPIRY_SKEW_SECONDS
+                    self._token_ready.set()
 
                     logger.info("Successfully obtained Power BI access token")
                     return self.token_cache["token"]
@@ -96,27 +207,21 @@ class PowerBIService:
         """
         # Check cache first
         cache_key = f"dataset_{self.settings.POWERBI_AXIA_DATASET_ID}"
-        if cache_key in self.dataset_cache:
-            cache_entry = self.dataset_cache[cache_key]
-            if datetime.now() < cache_entry["expires"]:
-                logger.debug("Using cached dataset details")
-                return cache_entry["data"]
+        cached = self.dataset_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Using cached dataset details")
+            return cached
 
         token = await self.get_access_token()
         headers = {'Authorization': f'Bearer {token}'}
 
-        url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}/datasets/{self.settings.POWERBI_AXIA_DATASET_ID}"
-
         try:
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(self._dataset_url, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
 
-                    # Cache the result
-                    self.dataset_cache[cache_key] = {
-                        "data": data,
-                        "expires": datetime.now() + timedelta(minutes=15)
-                    }
+                    # Cache the result (expires after DATASET_CACHE_TTL)
+                    self.dataset_cache[cache_key] = data
 
                     logger.info("Successfully retrieved Axia dataset details")
                     return data
@@ -135,6 +240,34 @@ class PowerBIService:
         """
         Execute DAX query against DS-Axia dataset
 
+        Concurrent calls with the same query share a single executeQueries
+        request; each caller receives its own copy of the result.
+
+        Args:
+            dax_query: DAX query string
+
+        Returns:
+            Query results dictionary
+        """
+        task = self._dax_inflight.get(dax_query)
+        if task is None:
+            task = asyncio.create_task(self._execute_axia_query(dax_query))
+            self._dax_inflight[dax_query] = task
+            task.add_done_callback(lambda done: self._forget_dax_query(dax_query, done))
+
+        # Shield so a cancelled caller does not abort the query for the others;
+        # copy so one caller mutating its result cannot corrupt another's
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget_dax_query(self, dax_query: str, task: asyncio.Task):
+        """Drop a finished query unless a newer request has replaced it"""
+        if self._dax_inflight.get(dax_query) is task:
+            del self._dax_inflight[dax_query]
+
+    async def _execute_axia_query(self, dax_query: str) -> Dict[str, Any]:
+        """
+        POST a single DAX query to the executeQueries endpoint
+
         Args:
             dax_query: DAX query string
 
@@ -147,8 +280,6 @@ class PowerBIService:
             'Content-Type': 'application/json'
         }
 
-        url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}/datasets/{self.settings.POWERBI_AXIA_DATASET_ID}/executeQueries"
-
         body = {
             "queries": [
                 {
@@ -163,7 +294,7 @@ class PowerBIService:
         logger.info(f"Executing DAX query on Axia dataset: {dax_query[:100]}...")
 
         try:
-            async with self.session.post(url, headers=headers, json=body) as response:
+            async with self.session.post(self._dax_url, headers=headers, json=body) as response:
                 if response.status == 200:
                     result = await response.json()
                     logger.info("DAX query executed successfully")
@@ -242,10 +373,8 @@ class PowerBIService:
         token = await self.get_access_token()
         headers = {'Authorization': f'Bearer {token}'}
 
-        url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}/datasets/{self.settings.POWERBI_AXIA_DATASET_ID}/tables"
-
         try:
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(self._tables_url, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
                     logger.info(f"Retrieved {len(data.get('value', []))} tables from Axia dataset")
@@ -271,14 +400,12 @@ class PowerBIService:
             'Content-Type': 'application/json'
         }
 
-        url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}/datasets/{self.settings.POWERBI_AXIA_DATASET_ID}/refreshes"
-
         body = {
             "notifyOption": "MailOnFailure"
         }
 
         try:
-            async with self.session.post(url, headers=headers, json=body) as response:
+            async with self.session.post(self._refreshes_url, headers=headers, json=body) as response:
                 if response.status in [200, 202]:
                     logger.info("Dataset refresh triggered successfully")
                     return {
@@ -311,7 +438,7 @@ class PowerBIService:
         token = await self.get_access_token()
         headers = {'Authorization': f'Bearer {token}'}
 
-        url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}/datasets/{self.settings.POWERBI_AXIA_DATASET_ID}/refreshes?$top={top}"
+        url = f"{self._refreshes_url}?$top={top}"
 
         try:
             async with self.session.get(url, headers=headers) as response:
@@ -336,10 +463,8 @@ class PowerBIService:
         token = await self.get_access_token()
         headers = {'Authorization': f'Bearer {token}'}
 
-        url = f"{self.settings.POWERBI_API_BASE}/groups/{self.settings.POWERBI_WORKSPACE_ID}/reports"
-
         try:
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(self._reports_url, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
                     reports = data.get("value", [])
@@ -4,22 +4,29 @@ Handles real-time bidirectional communication for chat functionality
 Optimized for 100+ concurrent connections with <100ms latency
 """
 
+import itertools
 import json
 import logging
+import orjson
 import gzip
+import sys
 import time
-from typing import Dict, List, Set, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Set, Optional, Any, Tuple, Union
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
 from datetime import datetime
-import uuid
 from collections import defaultdict, deque
+from dataclasses import dataclass
 from asyncio import Queue, Task
 import hashlib
 
 logger = logging.getLogger(__name__)
 
 
+async def _noop_send(data: str) -> None:
+    """Sender handed out for clients that are no longer connected"""
+
+
 class ConnectionPool:
     """Connection pool for managing WebSocket connections efficiently"""
 
@@ -90,6 +97,18 @@ class MessageBatcher:
         return batch
 
 
+@dataclass(slots=True)
+class ConnectionMetadata:
+    """Per-connection bookkeeping, slotted to keep thousands of clients compact"""
+    client_id: str
+    group: str
+    connected_at: float
+    last_activity: float
+    message_count: int = 0
+    compression_supported: bool = True
+    ws_index: int = 0
+
+
 class ConnectionManager:
     """Manages WebSocket connections with performance optimizations"""
 
@@ -100,11 +119,19 @@ class ConnectionManager:
         # Store active connections
         self.active_connections: Dict[str, WebSocket] = {}
 
+        # Parallel socket/id arrays so a full broadcast iterates a flat list
+        self._ws_list: List[WebSocket] = []
+        self._ws_ids: List[str] = []
+
+        # Cheap monotonically increasing IDs for clients that do not bring their own
+        self._next_id = itertools.count(1)
+
         # Connection metadata with optimized storage
-        self.connection_metadata: Dict[str, Dict] = {}
+        self.connection_metadata: Dict[str, ConnectionMetadata] = {}
 
-        # Message queues with size limits
-        self.message_queues: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        # Message queues with size limits (bounded deques drop the oldest entry)
+        self.max_queue = 100
+        self.message_queues: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.max_queue))
 
         # Message batching for efficient transmission
         self.message_batcher = MessageBatcher(batch_window_ms=100, max_batch_size=50)
@@ -146,21 +173,31 @@ class ConnectionManager:
         try:
             await websocket.accept()
 
-            # Generate client ID if not provided
+            # Generate client ID if not provided (skipping IDs taken by custom clients)
             if not client_id:
-                client_id = str(uuid.uuid4())
+                client_id = sys.intern(str(next(self._next_id)))
+                while client_id in self.active_connections:
+                    client_id = sys.intern(str(next(self._next_id)))
+
+            # Replace a previous connection reusing this ID
+            if client_id in self.active_connections:
+                self.disconnect(client_id)
 
             # Store connection
             self.active_connections[client_id] = websocket
 
             # Optimized metadata storage
-            self.connection_metadata[client_id] = {
-                "connected_at": time.time(),
-                "last_activity": time.time(),
-                "message_count": 0,
-                "group": group_id,
-                "compression_supported": True
-            }
+            now = time.time()
+            self.connection_metadata[client_id] = ConnectionMetadata(
+                client_id=client_id,
+                group=group_id,
+                connected_at=now,
+                last_activity=now,
+                ws_index=len(self._ws_list)
+            )
+            self._ws_list.append(websocket)
+            self._ws_ids.append(client_id)
+            self.message_queues[client_id] = deque(maxlen=self.max_queue)
 
             # Add to routing group
             self.connection_groups[group_id].add(client_id)
@@ -231,6 +268,15 @@ class ConnectionManager:
                 self.connection_groups[group_id].discard(client_id)
             self.client_groups.pop(client_id, None)
 
+            # Swap-pop out of the broadcast arrays, re-indexing the moved entry
+            index = self.connection_metadata[client_id].ws_index
+            last_ws = self._ws_list.pop()
+            last_id = self._ws_ids.pop()
+            if index < len(self._ws_list):
+                self._ws_list[index] = last_ws
+                self._ws_ids[index] = last_id
+                self.connection_metadata[last_id].ws_index = index
+
             # Clean up connection data
             del self.active_connections[client_id]
             del self.connection_metadata[client_id]
@@ -267,30 +313,33 @@ class ConnectionManager:
             bypass_batch: Skip batching for immediate send
             use_compression: Override compression setting
         """
-        if client_id not in self.active_connections:
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
             return
 
         try:
             # Check for duplicate messages
             msg_hash = self._get_message_hash(message)
-            if msg_hash in self.message_cache.get(client_id, set()):
+            sent_hashes = self.message_cache.get(client_id)
+            if sent_hashes is None:
+                sent_hashes = self.message_cache[client_id] = set()
+            elif msg_hash in sent_hashes:
                 logger.debug(f"Skipping duplicate message to {client_id}")
                 return
 
             # Add to deduplication cache
-            if client_id not in self.message_cache:
-                self.message_cache[client_id] = set()
-            self.message_cache[client_id].add(msg_hash)
+            sent_hashes.add(msg_hash)
 
             # Limit cache size
-            if len(self.message_cache[client_id]) > self.cache_size_limit:
+            if len(sent_hashes) > self.cache_size_limit:
                 self.message_cache[client_id] = set(
-                    list(self.message_cache[client_id])[-self.cache_size_limit:]
+                    list(sent_hashes)[-self.cache_size_limit:]
                 )
 
             # Update metadata
-            self.connection_metadata[client_id]["last_activity"] = time.time()
-            self.connection_metadata[client_id]["message_count"] += 1
+            metadata = self.connection_metadata[client_id]
+            metadata.last_activity = time.time()
+            metadata.message_count += 1
 
             # Store in queue
             self.message_queues[client_id].append(message)
@@ -309,7 +358,6 @@ class ConnectionManager:
             )
 
             # Prepare payload
-            websocket = self.active_connections[client_id]
             payload = messages_to_send[0] if len(messages_to_send) == 1 else {
                 "type": "batch",
                 "messages": messages_to_send
@@ -319,7 +367,7 @@ class ConnectionManager:
             if use_compression is None:
                 use_compression = (
                     self.compression_enabled and
-                    self.connection_metadata[client_id].get("compression_supported", False)
+                    metadata.compression_supported
                 )
 
             if use_compression and len(json.dumps(payload)) > 1024:  # Compress only larger messages
@@ -332,6 +380,22 @@ class ConnectionManager:
             logger.error(f"Error sending message to {client_id}: {str(e)}")
             self.disconnect(client_id)
 
+    def get_sender(self, client_id: str) -> Callable[[str], Awaitable[None]]:
+        """
+        Get a reusable send_text for one client, for tight streaming loops
+
+        The sender writes pre-encoded text straight to the socket, skipping the
+        dedupe, batching and metadata bookkeeping of send_personal_message.
+
+        Args:
+            client_id: Target client identifier
+
+        Returns:
+            The client's bound send_text, or a no-op if it is not connected
+        """
+        websocket = self.active_connections.get(client_id)
+        return websocket.send_text if websocket is not None else _noop_send
+
     async def broadcast(self, message: Dict, exclude_client: str = None, group_id: str = None):
         """
         Broadcast a message with smart routing to prevent N-squared problem
@@ -341,52 +405,86 @@ class ConnectionManager:
             exclude_client: Optional client ID to exclude from broadcast
             group_id: Optional group ID for targeted broadcast
         """
-        disconnected_clients = []
+        client_ids, websockets = self._broadcast_targets(exclude_client, group_id)
+        if not client_ids:
+            return
 
-        # Determine target clients based on group
-        if group_id:
-            target_clients = self.connection_groups.get(group_id, set())
+        # Encode (and compress) once for every recipient
+        body = orjson.dumps(message)
+        if self.compression_enabled and len(body) > 1024:
+            compressed = gzip.compress(body, compresslevel=self.compression_level)
+            await self._fan_out(client_ids, websockets, "send_bytes", compressed)
         else:
-            target_clients = set(self.active_connections.keys())
+            await self._fan_out(client_ids, websockets, "send_text", body.decode())
+
+    async def broadcast_json(self, data: Dict, exclude_client: str = None, group_id: str = None):
+        """
+        Broadcast a JSON message, encoding it once for every recipient
+
+        Args:
+            data: JSON-serializable message to broadcast
+            exclude_client: Optional client ID to exclude from broadcast
+            group_id: Optional group ID for targeted broadcast
+        """
+        await self.broadcast_raw(orjson.dumps(data), exclude_client, group_id)
 
-        # Remove excluded client
-        if exclude_client:
-            target_clients = target_clients - {exclude_client}
+    async def broadcast_raw(
+        self,
+        payload: Union[bytes, str],
+        exclude_client: str = None,
+        group_id: str = None
+    ):
+        """
+        Broadcast an already-encoded JSON payload without re-serializing it
 
-        # Use batch sending for efficiency
-        send_tasks = []
+        Args:
+            payload: UTF-8 JSON document, e.g. a cached upstream response body
+            exclude_client: Optional client ID to exclude from broadcast
+            group_id: Optional group ID for targeted broadcast
+        """
+        client_ids, websockets = self._broadcast_targets(exclude_client, group_id)
+        if not client_ids:
+            return
 
-        for client_id in target_clients:
-            if client_id in self.active_connections:
-                websocket = self.active_connections[client_id]
-                # Create async task for parallel sending
-                task = self._send_with_error_handling(client_id, websocket, message)
-                send_tasks.append(task)
+        # Sent as a text frame: the frontend parses JSON text, not binary frames
+        if isinstance(payload, bytes):
+            payload = payload.decode()
+        await self._fan_out(client_ids, websockets, "send_text", payload)
 
-        # Execute all sends in parallel
-        results = await asyncio.gather(*send_tasks, return_exceptions=True)
+    def _broadcast_targets(
+        self,
+        exclude_client: Optional[str],
+        group_id: Optional[str]
+    ) -> Tuple[List[str], List[WebSocket]]:
+        """Resolve the client IDs and sockets a broadcast should reach"""
+        # Full broadcast: snapshot the flat arrays (disconnects mutate them)
+        if not group_id and not exclude_client:
+            return self._ws_ids[:], self._ws_list[:]
 
-        # Collect disconnected clients
-        for client_id, result in zip(target_clients, results):
+        if group_id:
+            target_clients = self.connection_groups.get(group_id, set())
+        else:
+            target_clients = self._ws_ids
+
+        client_ids = [
+            client_id for client_id in target_clients
+            if client_id != exclude_client and client_id in self.active_connections
+        ]
+        return client_ids, [self.active_connections[client_id] for client_id in client_ids]
+
+    async def _fan_out(self, client_ids: List[str], websockets: List[WebSocket], send_method: str, payload: Any):
+        """Send one pre-encoded payload to every client concurrently"""
+        # Concurrent sends so one slow client cannot stall the rest
+        results = await asyncio.gather(
+            *(getattr(websocket, send_method)(payload) for websocket in websockets),
+            return_exceptions=True
+        )
+
+        # client_ids and results are aligned; drop clients whose send failed
+        for client_id, result in zip(client_ids, results):
             if isinstance(result, Exception):
                 logger.error(f"Error broadcasting to {client_id}: {str(result)}")
-                disconnected_clients.append(client_id)
-
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
-
-    async def _send_with_error_handling(self, client_id: str, websocket: WebSocket, message: Dict):
-        """Helper method for sending with error handling"""
-        try:
-            # Apply compression for broadcast messages
-            if self.compression_enabled and len(json.dumps(message)) > 1024:
-                compressed = self._compress_message(message)
-                await websocket.send_bytes(compressed)
-            else:
-                await websocket.send_json(message)
-        except Exception as e:
-            raise e
+                self.disconnect(client_id)
 
     async def send_typing_indicator(self, client_id: str, is_typing: bool = True):
         """
@@ -433,7 +531,7 @@ class ConnectionManager:
             client_id: Client sending heartbeat
         """
         if client_id in self.connection_metadata:
-            self.connection_metadata[client_id]["last_activity"] = datetime.now().isoformat()
+            self.connection_metadata[client_id].last_activity = time.time()
 
         await self.send_personal_message(
             {
@@ -452,7 +550,7 @@ class ConnectionManager:
             Connection statistics dictionary
         """
         total_messages = sum(
-            metadata["message_count"]
+            metadata.message_count
             for metadata in self.connection_metadata.values()
         )
 
@@ -462,9 +560,9 @@ class ConnectionManager:
             "connections": [
                 {
                     "client_id": client_id,
-                    "connected_at": metadata["connected_at"],
-                    "last_activity": metadata["last_activity"],
-                    "message_count": metadata["message_count"]
+                    "connected_at": metadata.connected_at,
+                    "last_activity": metadata.last_activity,
+                    "message_count": metadata.message_count
                 }
                 for client_id, metadata in self.connection_metadata.items()
             ]
@@ -477,12 +575,11 @@ class ConnectionManager:
         Args:
             timeout_minutes: Minutes of inactivity before disconnection
         """
-        current_time = datetime.now()
+        cutoff = time.time() - timeout_minutes * 60
         disconnected = []
 
         for client_id, metadata in self.connection_metadata.items():
-            last_activity = datetime.fromisoformat(metadata["last_activity"])
-            if (current_time - last_activity).total_seconds() > timeout_minutes * 60:
+            if metadata.last_activity < cutoff:
                 logger.info(f"Disconnecting inactive client: {client_id}")
                 disconnected.append(client_id)
 
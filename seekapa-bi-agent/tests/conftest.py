@@ -0,0 +1,17 @@
+"""
+Shared pytest configuration for the backend test suites
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop, the loop uvicorn uses in production"""
+    try:
+        import uvloop
+    except ImportError:  # uvloop does not support Windows
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
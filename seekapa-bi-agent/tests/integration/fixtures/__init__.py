@@ -0,0 +1 @@
+"""Shared fixtures for integration tests"""
@@ -0,0 +1,14 @@
+"""
+Lightweight FastAPI app for integration tests
+Mounts the production routers without the lifespan, middleware and logging
+setup of app.main; services are swapped in via app.dependency_overrides
+"""
+
+from fastapi import FastAPI
+
+from app.routers import analysis, chat, health, powerbi, webhooks
+
+app = FastAPI(title="Seekapa Copilot - Test Stub")
+
+for module in (health, chat, powerbi, analysis, webhooks):
+    app.include_router(module.router)
@@ -4,24 +4,42 @@ Tests the Power BI REST API integration and OAuth authentication
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
+import time
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import aiohttp
-from datetime import datetime, timedelta
+import httpx
+from aioresponses import aioresponses
 from typing import Optional, Dict, Any, List
 
 # Import the service we're testing
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../backend'))
+from app.services.http_pool import HTTP2Session
+from app.services.powerbi import (
+    TOKEN_EXPIRY_SKEW_SECONDS,
+    TOKEN_REFRESH_LEAD_SECONDS,
+    TOKEN_REFRESH_RETRY_SECONDS,
+    PowerBIService,
+)
 
-from app.services.powerbi import PowerBIService
+_AUTHORITY = "https://login.microsoftonline.com/test-tenant-id"
+_API_BASE = "https://api.powerbi.com/v1.0/myorg"
+_TOKEN_URL = f"{_AUTHORITY}/oauth2/v2.0/token"
+_DATASET_URL = f"{_API_BASE}/groups/test-workspace-id/datasets/test-dataset-id"
+_DAX_URL = f"{_DATASET_URL}/executeQueries"
+_TABLES_URL = f"{_DATASET_URL}/tables"
+_REFRESHES_URL = f"{_DATASET_URL}/refreshes"
+
+
+def _request_count(mock: aioresponses) -> int:
+    """Total requests aioresponses intercepted"""
+    return sum(len(calls) for calls in mock.requests.values())
 
 
 class TestPowerBIService:
     """Test suite for Power BI Service"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_settings(self):
         """Mock settings for testing"""
         settings_mock = Mock()
@@ -31,15 +49,46 @@ class TestPowerBIService:
         settings_mock.POWERBI_USERNAME = "test@example.com"
         settings_mock.POWERBI_PASSWORD = "test-password"
         settings_mock.POWERBI_DATASET_ID = "test-dataset-id"
+        settings_mock.POWERBI_SCOPE = "https://analysis.windows.net/powerbi/api/.default"
+        settings_mock.POWERBI_AUTHORITY = _AUTHORITY
+        settings_mock.POWERBI_API_BASE = _API_BASE
+        settings_mock.POWERBI_WORKSPACE_ID = "test-workspace-id"
+        settings_mock.POWERBI_AXIA_DATASET_ID = "test-dataset-id"
+        settings_mock.POWERBI_HTTP2 = False
+        settings_mock.DATASET_CACHE_SIZE = 64
+        settings_mock.DATASET_CACHE_TTL = 900
         return settings_mock
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def powerbi_service(self, mock_settings):
-        """Create Power BI service instance for testing"""
+        """Create Power BI service instance shared by the suite"""
         with patch('app.services.powerbi.settings', mock_settings):
             service = PowerBIService()
             return service
 
+    @pytest_asyncio.fixture
+    async def mock_aioresponse(self, powerbi_service):
+        """Intercept the service's aiohttp requests at the transport layer"""
+        with aioresponses() as m:
+            powerbi_service.session = aiohttp.ClientSession()
+            yield m
+            await powerbi_service.session.close()
+
+    @pytest.fixture
+    def cached_token(self, powerbi_service):
+        """Prime the token cache so data calls skip the OAuth request"""
+        powerbi_service.token_cache.update(token="test-token", expires=time.monotonic() + 1800)
+
+    @pytest.fixture(autouse=True)
+    def reset_powerbi_service(self, powerbi_service):
+        """Reset the shared service and drop attributes a test patched in"""
+        constructed = set(vars(powerbi_service))
+        powerbi_service.reset()
+        yield
+        for name in set(vars(powerbi_service)) - constructed:
+            delattr(powerbi_service, name)
+        powerbi_service.session = None
+
     @pytest.mark.asyncio
     async def test_service_initialization(self, powerbi_service):
         """Test service initialization"""
@@ -52,86 +101,184 @@ class TestPowerBIService:
         assert powerbi_service.session is not None
         assert isinstance(powerbi_service.session, aiohttp.ClientSession)
 
+        await powerbi_service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_scheduled(self, powerbi_service):
+        """Test initialize starts the token refresh task and cleanup stops it"""
+        await powerbi_service.initialize()
+
+        refresh_task = powerbi_service._refresh_task
+        assert refresh_task is not None
+        assert not refresh_task.done()
+
+        await powerbi_service.cleanup()
+
+        assert powerbi_service._refresh_task is None
+        assert refresh_task.cancelled()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("expires_in, expected_sleep", [
+        (1800, 1800 - TOKEN_REFRESH_LEAD_SECONDS),
+        (5, TOKEN_REFRESH_RETRY_SECONDS),
+    ])
+    async def test_background_refresh_sleeps_until_renewal_lead(
+        self, powerbi_service, expires_in, expected_sleep
+    ):
+        """Test the refresh loop wakes a lead ahead of the cached deadline, never less than the retry floor"""
+        powerbi_service.token_cache.update(token="test-token", expires=time.monotonic() + expires_in)
+        powerbi_service._token_ready.set()
+
+        with patch('app.services.powerbi.asyncio.sleep', AsyncMock(side_effect=RuntimeError("stop"))) as sleep:
+            with pytest.raises(RuntimeError):
+                await powerbi_service._refresh_loop()
+
+        assert sleep.await_args.args[0] == pytest.approx(expected_sleep, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_token_cached_at_renewal_moment(self, powerbi_service, mock_aioresponse):
+        """Test requests arriving when the background renewal fires still hit the cache"""
+        mock_aioresponse.post(_TOKEN_URL, payload={"access_token": "test-token", "expires_in": 3600})
+        requested_at = time.monotonic()
+        await powerbi_service.get_access_token()
+
+        # The cached deadline keeps a skew buffer inside Azure AD's expiry
+        deadline = powerbi_service.token_cache["expires"]
+        assert requested_at + 3600 - TOKEN_EXPIRY_SKEW_SECONDS <= deadline
+        assert deadline <= time.monotonic() + 3600 - TOKEN_EXPIRY_SKEW_SECONDS
+
+        with patch('app.services.powerbi.asyncio.sleep', AsyncMock(side_effect=RuntimeError("stop"))) as sleep:
+            with pytest.raises(RuntimeError):
+                await powerbi_service._refresh_loop()
+        renewal_at = time.monotonic() + sleep.await_args.args[0]
+        # Renewal fires a further lead ahead of the cached deadline
+        assert renewal_at == pytest.approx(deadline - TOKEN_REFRESH_LEAD_SECONDS, abs=1)
+
+        with patch('app.services.powerbi.time.monotonic', return_value=renewal_at):
+            token = await powerbi_service.get_access_token()
+
+        assert token == "test-token"
+        assert _request_count(mock_aioresponse) == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_inflight_refresh(self, powerbi_service):
+        """Test cleanup stops an in-flight token request before closing the session"""
+        await powerbi_service.initialize()
+        session = powerbi_service.session
+        request_started = asyncio.Event()
+
+        async def slow_request():
+            request_started.set()
+            await asyncio.sleep(60)
+
+        with patch.object(powerbi_service, '_request_access_token', slow_request):
+            waiter = asyncio.create_task(powerbi_service.get_access_token())
+            await request_started.wait()
+            inflight = powerbi_service._refresh_inflight
+
+            await powerbi_service.cleanup()
+
+        assert inflight.cancelled()
+        assert powerbi_service._refresh_inflight is None
+        assert session.closed
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
     @pytest.mark.asyncio
     async def test_service_cleanup(self, powerbi_service):
         """Test service cleanup"""
         await powerbi_service.initialize()
-        session_mock = Mock()
-        session_mock.close = AsyncMock()
-        powerbi_service.session = session_mock
+        session = powerbi_service.session
 
         await powerbi_service.cleanup()
 
-        session_mock.close.assert_called_once()
+        assert powerbi_service.session is None
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_services_share_session(self, powerbi_service):
+        """Test initialized services reuse one pooled session"""
+        other_service = PowerBIService()
+        await powerbi_service.initialize()
+        await other_service.initialize()
+
+        assert other_service.session is powerbi_service.session
+
+        await other_service.cleanup()
+        assert not powerbi_service.session.closed
+
+        session = powerbi_service.session
+        await powerbi_service.cleanup()
+        assert session.closed
 
     @pytest.mark.asyncio
-    async def test_get_access_token_success(self, powerbi_service):
+    async def test_replaced_session_closes_with_its_last_holder(self, powerbi_service):
+        """Test a session replaced for another loop stays open until its own holders release it"""
+        await powerbi_service.initialize()
+        old_session = powerbi_service.session
+
+        # Pretend the pooled session belongs to another event loop
+        with patch('app.services.http_pool._session_loop', object()):
+            first_service = PowerBIService()
+            await first_service.initialize()
+        second_service = PowerBIService()
+        await second_service.initialize()
+        new_session = first_service.session
+
+        assert new_session is not old_session
+        assert second_service.session is new_session
+
+        await first_service.cleanup()
+        assert not new_session.closed
+        assert not old_session.closed
+
+        await powerbi_service.cleanup()
+        assert old_session.closed
+        assert not new_session.closed
+
+        await second_service.cleanup()
+        assert new_session.closed
+
+    @pytest.mark.asyncio
+    async def test_get_access_token_success(self, powerbi_service, mock_aioresponse):
         """Test successful access token retrieval"""
-        # Mock HTTP response for token request
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        mock_aioresponse.post(_TOKEN_URL, payload={
             "access_token": "test-access-token",
-            "expires_in": 3600,
-            "refresh_token": "test-refresh-token"
+            "expires_in": 3600
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
         # Execute test
         token = await powerbi_service.get_access_token()
 
         # Assertions
         assert token == "test-access-token"
         assert powerbi_service.token_cache["token"] == "test-access-token"
-        assert powerbi_service.token_cache["refresh_token"] == "test-refresh-token"
-        assert powerbi_service.token_cache["expires"] is not None
+        assert powerbi_service.token_cache["expires"] > time.monotonic()
 
     @pytest.mark.asyncio
-    async def test_get_access_token_cached(self, powerbi_service):
+    async def test_get_access_token_cached(self, powerbi_service, mock_aioresponse):
         """Test access token retrieval from cache"""
         # Set up cached token that's not expired
-        future_expiry = datetime.utcnow() + timedelta(minutes=30)
-        powerbi_service.token_cache = {
-            "token": "cached-token",
-            "expires": future_expiry,
-            "refresh_token": "cached-refresh-token"
-        }
+        powerbi_service.token_cache.update(token="cached-token", expires=time.monotonic() + 1800)
 
         # Execute test
         token = await powerbi_service.get_access_token()
 
         # Assertions
         assert token == "cached-token"
+        assert not mock_aioresponse.requests
 
     @pytest.mark.asyncio
-    async def test_get_access_token_expired_cache(self, powerbi_service):
+    async def test_get_access_token_expired_cache(self, powerbi_service, mock_aioresponse):
         """Test access token retrieval when cached token is expired"""
         # Set up expired cached token
-        past_expiry = datetime.utcnow() - timedelta(minutes=30)
-        powerbi_service.token_cache = {
-            "token": "expired-token",
-            "expires": past_expiry,
-            "refresh_token": "expired-refresh-token"
-        }
-
-        # Mock HTTP response for new token request
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        powerbi_service.token_cache.update(token="expired-token", expires=time.monotonic() - 1800)
+
+        mock_aioresponse.post(_TOKEN_URL, payload={
             "access_token": "new-access-token",
-            "expires_in": 3600,
-            "refresh_token": "new-refresh-token"
+            "expires_in": 3600
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
         # Execute test
         token = await powerbi_service.get_access_token()
 
@@ -140,34 +287,20 @@ class TestPowerBIService:
         assert powerbi_service.token_cache["token"] == "new-access-token"
 
     @pytest.mark.asyncio
-    async def test_get_access_token_failure(self, powerbi_service):
+    async def test_get_access_token_failure(self, powerbi_service, mock_aioresponse):
         """Test access token retrieval failure"""
-        # Mock HTTP error response
-        mock_response = Mock()
-        mock_response.status = 400
-        mock_response.text = AsyncMock(return_value="Bad Request")
-
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
+        mock_aioresponse.post(_TOKEN_URL, status=400, body="Bad Request")
 
         # Execute test and expect exception
         with pytest.raises(Exception) as exc_info:
             await powerbi_service.get_access_token()
 
-        assert "Failed to get access token" in str(exc_info.value)
+        assert "Failed to get Power BI token" in str(exc_info.value)
 
     @pytest.mark.asyncio
-    async def test_get_dataset_info_success(self, powerbi_service):
+    async def test_get_dataset_details_success(self, powerbi_service, mock_aioresponse, cached_token):
         """Test successful dataset information retrieval"""
-        # Mock access token
-        powerbi_service.get_access_token = AsyncMock(return_value="test-token")
-
-        # Mock HTTP response for dataset info
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        mock_aioresponse.get(_DATASET_URL, payload={
             "id": "test-dataset-id",
             "name": "DS-Axia Dataset",
             "tables": [
@@ -176,13 +309,8 @@ class TestPowerBIService:
             ]
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
         # Execute test
-        dataset_info = await powerbi_service.get_dataset_info()
+        dataset_info = await powerbi_service.get_axia_dataset_details()
 
         # Assertions
         assert dataset_info["name"] == "DS-Axia Dataset"
@@ -190,75 +318,51 @@ class TestPowerBIService:
         assert dataset_info["tables"][0]["name"] == "Sales"
 
     @pytest.mark.asyncio
-    async def test_execute_dax_query_success(self, powerbi_service):
+    async def test_query_axia_data_success(self, powerbi_service, mock_aioresponse, cached_token):
         """Test successful DAX query execution"""
-        # Mock access token
-        powerbi_service.get_access_token = AsyncMock(return_value="test-token")
-
-        # Mock HTTP response for DAX query
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        mock_aioresponse.post(_DAX_URL, payload={
             "results": [{
                 "tables": [{
+                    "name": "Sales",
+                    "columns": [{"name": "Amount"}, {"name": "Date"}],
                     "rows": [
-                        {"[Sales].[Amount]": 1000, "[Sales].[Date]": "2024-01-01"},
-                        {"[Sales].[Amount]": 1500, "[Sales].[Date]": "2024-01-02"}
+                        {"Sales[Amount]": 1000, "Sales[Date]": "2024-01-01"},
+                        {"Sales[Amount]": 1500, "Sales[Date]": "2024-01-02"}
                     ]
                 }]
             }]
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
         # Execute test
-        dax_query = "EVALUATE TOPN(10, Sales)"
-        result = await powerbi_service.execute_dax_query(dax_query)
+        result = await powerbi_service.query_axia_data("EVALUATE TOPN(10, Sales)")
 
         # Assertions
-        assert "results" in result
-        assert len(result["results"][0]["tables"][0]["rows"]) == 2
+        assert result["success"] is True
+        assert result["row_count"] == 2
+        assert result["data"][0] == {"Amount": 1000, "Date": "2024-01-01"}
 
     @pytest.mark.asyncio
-    async def test_execute_dax_query_invalid_syntax(self, powerbi_service):
+    async def test_query_axia_data_invalid_syntax(self, powerbi_service, mock_aioresponse, cached_token):
         """Test DAX query execution with invalid syntax"""
-        # Mock access token
-        powerbi_service.get_access_token = AsyncMock(return_value="test-token")
-
-        # Mock HTTP error response for invalid DAX
-        mock_response = Mock()
-        mock_response.status = 400
-        mock_response.json = AsyncMock(return_value={
+        mock_aioresponse.post(_DAX_URL, status=400, payload={
             "error": {
                 "code": "InvalidSyntax",
                 "message": "Invalid DAX syntax"
             }
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
-        # Execute test and expect exception
-        with pytest.raises(Exception) as exc_info:
-            await powerbi_service.execute_dax_query("INVALID DAX QUERY")
+        # Execute test
+        result = await powerbi_service.query_axia_data("INVALID DAX QUERY")
 
-        assert "DAX query failed" in str(exc_info.value)
+        # Assertions
+        assert result["error"] == "Query failed: 400"
+        assert "InvalidSyntax" in result["details"]
+        assert result["query"] == "INVALID DAX QUERY"
 
     @pytest.mark.asyncio
-    async def test_get_dataset_tables_success(self, powerbi_service):
+    async def test_get_axia_tables_success(self, powerbi_service, mock_aioresponse, cached_token):
         """Test successful dataset tables retrieval"""
-        # Mock access token
-        powerbi_service.get_access_token = AsyncMock(return_value="test-token")
-
-        # Mock HTTP response for tables
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        mock_aioresponse.get(_TABLES_URL, payload={
             "value": [
                 {
                     "name": "Sales",
@@ -279,74 +383,49 @@ class TestPowerBIService:
             ]
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
         # Execute test
-        tables = await powerbi_service.get_dataset_tables()
+        tables = await powerbi_service.get_axia_tables()
 
         # Assertions
-        assert len(tables["value"]) == 2
-        assert tables["value"][0]["name"] == "Sales"
-        assert len(tables["value"][0]["columns"]) == 3
+        assert len(tables) == 2
+        assert tables[0]["name"] == "Sales"
+        assert len(tables[0]["columns"]) == 3
 
     @pytest.mark.asyncio
-    async def test_refresh_dataset_success(self, powerbi_service):
+    async def test_refresh_axia_dataset_success(self, powerbi_service, mock_aioresponse, cached_token):
         """Test successful dataset refresh"""
-        # Mock access token
-        powerbi_service.get_access_token = AsyncMock(return_value="test-token")
-
-        # Mock HTTP response for refresh
-        mock_response = Mock()
-        mock_response.status = 202
-        mock_response.headers = {"Location": "https://api.powerbi.com/refresh/123"}
-
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
+        mock_aioresponse.post(
+            _REFRESHES_URL,
+            status=202,
+            headers={"Location": "https://api.powerbi.com/refresh/123"}
+        )
 
         # Execute test
-        result = await powerbi_service.refresh_dataset()
+        result = await powerbi_service.refresh_axia_dataset()
 
         # Assertions
-        assert result["status"] == "initiated"
-        assert "location" in result
+        assert result["success"] is True
+        assert "timestamp" in result
 
     @pytest.mark.asyncio
-    async def test_dataset_caching(self, powerbi_service):
+    async def test_dataset_caching(self, powerbi_service, mock_aioresponse, cached_token):
         """Test dataset information caching"""
-        # Mock access token
-        powerbi_service.get_access_token = AsyncMock(return_value="test-token")
-
-        # Mock HTTP response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"name": "Test Dataset"})
-
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
+        # Registered once: a second request would fail to match
+        mock_aioresponse.get(_DATASET_URL, payload={"name": "Test Dataset"})
 
         # First call should make HTTP request
-        result1 = await powerbi_service.get_dataset_info()
-        assert mock_session.get.call_count == 1
+        result1 = await powerbi_service.get_axia_dataset_details()
 
-        # Second call should use cache (if implemented)
-        result2 = await powerbi_service.get_dataset_info()
+        # Second call should be served from the TTL cache
+        result2 = await powerbi_service.get_axia_dataset_details()
 
-        assert result1 == result2
+        assert result1 == result2 == {"name": "Test Dataset"}
+        assert _request_count(mock_aioresponse) == 1
 
     @pytest.mark.asyncio
-    async def test_error_handling_network_failure(self, powerbi_service):
+    async def test_error_handling_network_failure(self, powerbi_service, mock_aioresponse):
         """Test error handling for network failures"""
-        # Mock network failure
-        mock_session = AsyncMock()
-        mock_session.post.side_effect = aiohttp.ClientError("Network error")
-        powerbi_service.session = mock_session
+        mock_aioresponse.post(_TOKEN_URL, exception=aiohttp.ClientError("Network error"))
 
         # Execute test and expect exception
         with pytest.raises(Exception) as exc_info:
@@ -354,6 +433,97 @@ class TestPowerBIService:
 
         assert "Network error" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_coalesce(self, powerbi_service):
+        """Test identical in-flight DAX queries share one request"""
+        release = asyncio.Event()
+
+        async def slow_query(dax_query):
+            await release.wait()
+            return {"success": True, "data": [], "query": dax_query}
+
+        powerbi_service._execute_axia_query = AsyncMock(side_effect=slow_query)
+
+        dax_query = "EVALUATE TOPN(10, Sales)"
+        tasks = [asyncio.create_task(powerbi_service.query_axia_data(dax_query)) for _ in range(5)]
+        other = asyncio.create_task(powerbi_service.query_axia_data("EVALUATE Products"))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, other)
+
+        assert all(result["query"] == dax_query for result in results[:5])
+        assert results[5]["query"] == "EVALUATE Products"
+        assert powerbi_service._execute_axia_query.call_count == 2
+        assert powerbi_service._dax_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_coalesced_query_results_are_independent(self, powerbi_service):
+        """Test callers sharing a DAX request each get their own result"""
+        release = asyncio.Event()
+
+        async def slow_query(dax_query):
+            await release.wait()
+            return {"success": True, "data": [{"Amount": 1000}]}
+
+        powerbi_service._execute_axia_query = AsyncMock(side_effect=slow_query)
+
+        tasks = [asyncio.create_task(powerbi_service.query_axia_data("EVALUATE Sales")) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        first, second = await asyncio.gather(*tasks)
+
+        first["data"][0]["Amount"] = 0
+        assert second["data"] == [{"Amount": 1000}]
+        assert powerbi_service._execute_axia_query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_query_does_not_evict_newer_request(self, powerbi_service):
+        """Test a finished query only clears its own in-flight entry"""
+        releases = [asyncio.Event(), asyncio.Event()]
+        pending = iter(releases)
+
+        async def slow_query(dax_query):
+            await next(pending).wait()
+            return {"success": True, "data": []}
+
+        powerbi_service._execute_axia_query = AsyncMock(side_effect=slow_query)
+
+        dax_query = "EVALUATE Sales"
+        stale = asyncio.create_task(powerbi_service.query_axia_data(dax_query))
+        await asyncio.sleep(0)
+        powerbi_service.reset()
+        fresh = asyncio.create_task(powerbi_service.query_axia_data(dax_query))
+        await asyncio.sleep(0)
+        fresh_task = powerbi_service._dax_inflight[dax_query]
+
+        releases[0].set()
+        await stale
+        assert powerbi_service._dax_inflight.get(dax_query) is fresh_task
+
+        releases[1].set()
+        await fresh
+        assert powerbi_service._dax_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_http2_session_token_request(self, powerbi_service):
+        """Test the HTTP/2 session serves the service's token request"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.method == "POST"
+            assert request.headers["content-type"] == "application/x-www-form-urlencoded"
+            assert request.content == powerbi_service._token_post_body
+            return httpx.Response(200, json={"access_token": "h2-token", "expires_in": 3600})
+
+        session = HTTP2Session()
+        await session.close()
+        session._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        powerbi_service.session = session
+
+        token = await powerbi_service.get_access_token()
+
+        assert token == "h2-token"
+        await session.close()
+        assert session.closed
+
     def test_token_cache_initialization(self, powerbi_service):
         """Test token cache is properly initialized"""
         assert powerbi_service.token_cache["token"] is None
@@ -361,27 +531,20 @@ class TestPowerBIService:
         assert powerbi_service.token_cache["refresh_token"] is None
 
     @pytest.mark.asyncio
-    async def test_concurrent_token_requests(self, powerbi_service):
+    async def test_concurrent_token_requests(self, powerbi_service, mock_aioresponse):
         """Test handling of concurrent token requests"""
-        # Mock HTTP response for token request
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        mock_aioresponse.post(_TOKEN_URL, payload={
             "access_token": "test-token",
             "expires_in": 3600
         })
 
-        # Mock session
-        mock_session = AsyncMock()
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-        powerbi_service.session = mock_session
-
         # Execute concurrent requests
         tasks = [powerbi_service.get_access_token() for _ in range(5)]
         results = await asyncio.gather(*tasks)
 
-        # All should return the same token
+        # All should return the same token from a single POST
         assert all(token == "test-token" for token in results)
+        assert _request_count(mock_aioresponse) == 1
 
 
 if __name__ == "__main__":
@@ -4,50 +4,75 @@ Tests the WebSocket connection management and real-time communication
 """
 
 import pytest
+import pytest_asyncio
+import anyio
+import anyio.lowlevel
 import asyncio
 import json
+import time
+from collections import deque
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
-from datetime import datetime
 from typing import Dict, List, Set
 
 # Import the service we're testing
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../../backend'))
-
 from app.services.websocket import ConnectionManager
 
 
+# Frames a mock socket buffers before a send waits on the reading client
+_SEND_BUFFER_SIZE = 16
+
+
 class MockWebSocket:
-    """Mock WebSocket for testing"""
+    """Mock WebSocket for testing, sending through a bounded anyio stream
+
+    The client side runs as a reader task (see websocket_factory), so a send
+    waits whenever the reader falls a full buffer behind.
+    """
 
     def __init__(self):
         self.closed = False
-        self.sent_messages = []
-        self.receive_queue = []
+        self._send_stream, self._receive_stream = anyio.create_memory_object_stream(_SEND_BUFFER_SIZE)
+        self.sent_messages: List = []
+        self.receive_queue = deque()
         self.accept_called = False
 
+    async def read_frames(self):
+        """Client side: collect frames until the server side is closed"""
+        async with self._receive_stream:
+            async for frame in self._receive_stream:
+                self.sent_messages.append(frame)
+
+    def close_stream(self):
+        """Close the server side so read_frames finishes"""
+        self._send_stream.close()
+
+    async def _send(self, frame):
+        if self.closed:
+            raise Exception("WebSocket is closed")
+        await self._send_stream.send(frame)
+        # A socket write yields to the loop, which lets the reader take the frame
+        await anyio.lowlevel.checkpoint()
+
     async def accept(self):
         self.accept_called = True
 
     async def send_text(self, data: str):
-        if self.closed:
-            raise Exception("WebSocket is closed")
-        self.sent_messages.append(data)
+        await self._send(data)
+
+    async def send_bytes(self, data: bytes):
+        await self._send(data)
 
     async def send_json(self, data: dict):
-        if self.closed:
-            raise Exception("WebSocket is closed")
-        self.sent_messages.append(json.dumps(data))
+        await self._send(json.dumps(data))
 
     async def receive_text(self):
         if self.receive_queue:
-            return self.receive_queue.pop(0)
+            return self.receive_queue.popleft()
         raise Exception("No messages in queue")
 
     async def receive_json(self):
         if self.receive_queue:
-            message = self.receive_queue.pop(0)
+            message = self.receive_queue.popleft()
             return json.loads(message)
         raise Exception("No messages in queue")
 
@@ -59,6 +84,23 @@ class MockWebSocket:
         self.receive_queue.append(message)
 
 
+class InFlightMockWebSocket(MockWebSocket):
+    """Mock WebSocket that records how many sends overlap with its own"""
+
+    def __init__(self, tracker: Dict[str, int]):
+        super().__init__()
+        self.tracker = tracker
+
+    async def send_text(self, data: str):
+        tracker = self.tracker
+        tracker["in_flight"] += 1
+        tracker["max_in_flight"] = max(tracker["max_in_flight"], tracker["in_flight"])
+        # Yield so any other scheduled sends can start before this one ends
+        await asyncio.sleep(0)
+        tracker["in_flight"] -= 1
+        await super().send_text(data)
+
+
 class TestConnectionManager:
     """Test suite for Connection Manager"""
 
@@ -67,10 +109,39 @@ class TestConnectionManager:
         """Create Connection Manager instance for testing"""
         return ConnectionManager()
 
-    @pytest.fixture
-    def mock_websocket(self):
+    @pytest_asyncio.fixture
+    async def websocket_factory(self):
+        """Build mock WebSockets, each with a running reader, and close them afterwards"""
+        websockets = []
+        readers = []
+
+        def make(cls=MockWebSocket, *args):
+            websocket = cls(*args)
+            websockets.append(websocket)
+            readers.append(asyncio.create_task(websocket.read_frames()))
+            return websocket
+
+        yield make
+
+        for websocket in websockets:
+            websocket.close_stream()
+        await asyncio.gather(*readers)
+
+    @pytest_asyncio.fixture
+    async def mock_websocket(self, websocket_factory):
         """Create mock WebSocket for testing"""
-        return MockWebSocket()
+        return websocket_factory()
+
+    @pytest.fixture
+    def connect_client(self, connection_manager, websocket_factory):
+        """Connect a mock client and drain its welcome frame"""
+        async def connect(websocket=None):
+            websocket = websocket or websocket_factory()
+            client_id = await connection_manager.connect(websocket)
+            websocket.sent_messages.clear()
+            return client_id, websocket
+
+        return connect
 
     @pytest.mark.asyncio
     async def test_connect_new_client(self, connection_manager, mock_websocket):
@@ -113,6 +184,19 @@ class TestConnectionManager:
         assert client_id not in connection_manager.connection_metadata
         assert client_id not in connection_manager.message_queues
 
+    @pytest.mark.asyncio
+    async def test_disconnect_keeps_broadcast_arrays_aligned(self, connection_manager, websocket_factory):
+        """Test swap-pop removal keeps socket and ID arrays in step"""
+        websockets = [websocket_factory() for _ in range(4)]
+        client_ids = [await connection_manager.connect(ws) for ws in websockets]
+
+        connection_manager.disconnect(client_ids[1])
+
+        assert len(connection_manager._ws_list) == 3
+        for index, client_id in enumerate(connection_manager._ws_ids):
+            assert connection_manager._ws_list[index] is connection_manager.active_connections[client_id]
+            assert connection_manager.connection_metadata[client_id].ws_index == index
+
     def test_disconnect_nonexistent_client(self, connection_manager):
         """Test disconnecting a non-existent client"""
         # This should not raise an exception
@@ -122,18 +206,18 @@ class TestConnectionManager:
         assert len(connection_manager.active_connections) == 0
 
     @pytest.mark.asyncio
-    async def test_send_personal_message(self, connection_manager, mock_websocket):
+    async def test_send_personal_message(self, connection_manager, connect_client):
         """Test sending a personal message to a specific client"""
         # Setup - connect client
-        client_id = await connection_manager.connect(mock_websocket)
+        client_id, mock_websocket = await connect_client()
 
         # Execute test
         test_message = "Hello, client!"
-        await connection_manager.send_personal_message(test_message, client_id)
+        await connection_manager.send_personal_message(test_message, client_id, bypass_batch=True)
 
-        # Assertions
+        # Assertions - messages go out JSON-encoded
         assert len(mock_websocket.sent_messages) == 1
-        assert mock_websocket.sent_messages[0] == test_message
+        assert json.loads(mock_websocket.sent_messages[0]) == test_message
 
     @pytest.mark.asyncio
     async def test_send_personal_message_nonexistent_client(self, connection_manager):
@@ -141,6 +225,20 @@ class TestConnectionManager:
         # Should not raise an exception
         await connection_manager.send_personal_message("Hello", "non-existent")
 
+    @pytest.mark.asyncio
+    async def test_get_sender(self, connection_manager, connect_client):
+        """Test get_sender returns a reusable sender for one client"""
+        client_id, mock_websocket = await connect_client()
+
+        send = connection_manager.get_sender(client_id)
+        for chunk in ("Hello", ", ", "client!"):
+            await send(chunk)
+
+        assert mock_websocket.sent_messages == ["Hello", ", ", "client!"]
+
+        # Unknown clients get a no-op sender
+        await connection_manager.get_sender("non-existent")("ignored")
+
     @pytest.mark.asyncio
     async def test_send_json_message(self, connection_manager, mock_websocket):
         """Test sending JSON message to client"""
@@ -157,16 +255,12 @@ class TestConnectionManager:
         assert sent_data == test_data
 
     @pytest.mark.asyncio
-    async def test_broadcast_message(self, connection_manager):
+    async def test_broadcast_message(self, connection_manager, connect_client):
         """Test broadcasting message to all connected clients"""
         # Setup - connect multiple clients
-        ws1 = MockWebSocket()
-        ws2 = MockWebSocket()
-        ws3 = MockWebSocket()
-
-        client1 = await connection_manager.connect(ws1)
-        client2 = await connection_manager.connect(ws2)
-        client3 = await connection_manager.connect(ws3)
+        client1, ws1 = await connect_client()
+        client2, ws2 = await connect_client()
+        client3, ws3 = await connect_client()
 
         # Execute test
         broadcast_message = "Broadcast to all!"
@@ -176,19 +270,16 @@ class TestConnectionManager:
         assert len(ws1.sent_messages) == 1
         assert len(ws2.sent_messages) == 1
         assert len(ws3.sent_messages) == 1
-        assert ws1.sent_messages[0] == broadcast_message
-        assert ws2.sent_messages[0] == broadcast_message
-        assert ws3.sent_messages[0] == broadcast_message
+        assert json.loads(ws1.sent_messages[0]) == broadcast_message
+        assert json.loads(ws2.sent_messages[0]) == broadcast_message
+        assert json.loads(ws3.sent_messages[0]) == broadcast_message
 
     @pytest.mark.asyncio
-    async def test_broadcast_json_message(self, connection_manager):
+    async def test_broadcast_json_message(self, connection_manager, connect_client):
         """Test broadcasting JSON message to all connected clients"""
         # Setup - connect multiple clients
-        ws1 = MockWebSocket()
-        ws2 = MockWebSocket()
-
-        client1 = await connection_manager.connect(ws1)
-        client2 = await connection_manager.connect(ws2)
+        client1, ws1 = await connect_client()
+        client2, ws2 = await connect_client()
 
         # Execute test
         broadcast_data = {"type": "broadcast", "message": "Hello everyone!"}
@@ -203,6 +294,56 @@ class TestConnectionManager:
         assert sent_data1 == broadcast_data
         assert sent_data2 == broadcast_data
 
+    @pytest.mark.asyncio
+    async def test_broadcast_raw_forwards_payload(self, connection_manager, connect_client):
+        """Test pre-encoded payloads are broadcast without re-encoding"""
+        client1, ws1 = await connect_client()
+        _, ws2 = await connect_client()
+
+        payload = b'{"type":"data_result","result":{"row_count":2}}'
+        await connection_manager.broadcast_raw(payload, exclude_client=client1)
+
+        assert ws1.sent_messages == []
+        assert ws2.sent_messages == [payload.decode()]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_1k_clients(self, connection_manager, connect_client):
+        """Test a broadcast reaches every one of 1000 clients"""
+        websockets = [(await connect_client())[1] for _ in range(1000)]
+
+        await connection_manager.broadcast({"type": "broadcast", "message": "Hello everyone!"})
+
+        assert all(len(ws.sent_messages) == 1 for ws in websockets)
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_broadcast_1k_clients_under_500ms(self, connection_manager, connect_client):
+        """Test a broadcast to 1000 clients stays fast (performance budget)"""
+        for _ in range(1000):
+            await connect_client()
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await connection_manager.broadcast({"type": "broadcast", "message": "Hello everyone!"})
+        elapsed = loop.time() - start
+
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_broadcast_is_concurrent(self, connection_manager, websocket_factory, connect_client):
+        """Test broadcast sends to all clients concurrently"""
+        tracker = {"in_flight": 0, "max_in_flight": 0}
+        websockets = [websocket_factory(InFlightMockWebSocket, tracker) for _ in range(5)]
+        for ws in websockets:
+            await connect_client(ws)
+        tracker["max_in_flight"] = 0
+
+        await connection_manager.broadcast({"type": "broadcast", "message": "Hello everyone!"})
+
+        # Every send was started before any of them finished
+        assert tracker["max_in_flight"] == len(websockets)
+        assert all(len(ws.sent_messages) == 1 for ws in websockets)
+
     @pytest.mark.asyncio
     async def test_connection_metadata_tracking(self, connection_manager, mock_websocket):
         """Test that connection metadata is properly tracked"""
@@ -211,14 +352,10 @@ class TestConnectionManager:
 
         # Assertions
         metadata = connection_manager.connection_metadata[client_id]
-        assert "connected_at" in metadata
-        assert "client_id" in metadata
-        assert metadata["client_id"] == client_id
+        assert metadata.client_id == client_id
 
         # Test timestamp is recent
-        connected_at = datetime.fromisoformat(metadata["connected_at"])
-        time_diff = datetime.utcnow() - connected_at
-        assert time_diff.total_seconds() < 10  # Connected within last 10 seconds
+        assert 0 <= time.time() - metadata.connected_at < 10  # Connected within last 10 seconds
 
     @pytest.mark.asyncio
     async def test_message_queue_initialization(self, connection_manager, mock_websocket):
@@ -226,15 +363,16 @@ class TestConnectionManager:
         # Execute test
         client_id = await connection_manager.connect(mock_websocket)
 
-        # Assertions
-        assert client_id in connection_manager.message_queues
-        assert connection_manager.message_queues[client_id] == []
+        # Assertions - connect queues the welcome message
+        queue = connection_manager.message_queues[client_id]
+        assert len(queue) == 1
+        assert queue[0]["type"] == "connection"
+        assert queue.maxlen == connection_manager.max_queue
 
     @pytest.mark.asyncio
-    async def test_send_message_to_closed_websocket(self, connection_manager):
+    async def test_send_message_to_closed_websocket(self, connection_manager, mock_websocket):
         """Test sending message to a closed WebSocket"""
         # Setup - connect and then close websocket
-        mock_websocket = MockWebSocket()
         client_id = await connection_manager.connect(mock_websocket)
         mock_websocket.closed = True
 
@@ -244,12 +382,12 @@ class TestConnectionManager:
         # The connection manager should handle the error gracefully
 
     @pytest.mark.asyncio
-    async def test_multiple_connections_different_ids(self, connection_manager):
+    async def test_multiple_connections_different_ids(self, connection_manager, websocket_factory):
         """Test that multiple connections get different IDs"""
         # Connect multiple clients
-        ws1 = MockWebSocket()
-        ws2 = MockWebSocket()
-        ws3 = MockWebSocket()
+        ws1 = websocket_factory()
+        ws2 = websocket_factory()
+        ws3 = websocket_factory()
 
         client1 = await connection_manager.connect(ws1)
         client2 = await connection_manager.connect(ws2)
@@ -267,14 +405,11 @@ class TestConnectionManager:
         assert len(connection_manager.active_connections) == 0
 
     @pytest.mark.asyncio
-    async def test_connection_resilience(self, connection_manager):
+    async def test_connection_resilience(self, connection_manager, connect_client):
         """Test connection manager resilience to various scenarios"""
         # Connect multiple clients
-        ws1 = MockWebSocket()
-        ws2 = MockWebSocket()
-
-        client1 = await connection_manager.connect(ws1)
-        client2 = await connection_manager.connect(ws2)
+        client1, ws1 = await connect_client()
+        client2, ws2 = await connect_client()
 
         # Simulate one connection failing
         ws1.closed = True
@@ -284,17 +419,18 @@ class TestConnectionManager:
 
         # Only the healthy connection should receive the message
         assert len(ws2.sent_messages) == 1
-        assert ws2.sent_messages[0] == "Test message"
+        assert json.loads(ws2.sent_messages[0]) == "Test message"
 
     @pytest.mark.asyncio
-    async def test_concurrent_connections(self, connection_manager):
+    async def test_concurrent_connections(self, connection_manager, websocket_factory):
         """Test handling concurrent connections"""
         # Create multiple websockets
-        websockets = [MockWebSocket() for _ in range(10)]
+        websockets = [websocket_factory() for _ in range(10)]
 
         # Connect them concurrently
-        tasks = [connection_manager.connect(ws) for ws in websockets]
-        client_ids = await asyncio.gather(*tasks)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(connection_manager.connect(ws)) for ws in websockets]
+        client_ids = [task.result() for task in tasks]
 
         # Assertions
         assert len(client_ids) == 10
@@ -302,20 +438,18 @@ class TestConnectionManager:
         assert len(connection_manager.active_connections) == 10
 
     @pytest.mark.asyncio
-    async def test_message_ordering(self, connection_manager, mock_websocket):
+    async def test_message_ordering(self, connection_manager, connect_client):
         """Test that messages are sent in correct order"""
         # Setup
-        client_id = await connection_manager.connect(mock_websocket)
+        client_id, mock_websocket = await connect_client()
 
         # Send multiple messages
         messages = ["Message 1", "Message 2", "Message 3"]
         for message in messages:
-            await connection_manager.send_personal_message(message, client_id)
+            await connection_manager.send_personal_message(message, client_id, bypass_batch=True)
 
         # Assertions
-        assert len(mock_websocket.sent_messages) == 3
-        for i, message in enumerate(messages):
-            assert mock_websocket.sent_messages[i] == message
+        assert [json.loads(frame) for frame in mock_websocket.sent_messages] == messages
 
     @pytest.mark.asyncio
     async def test_clean_disconnect(self, connection_manager, mock_websocket):